@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.utils.module_loading import import_string
+
+# Settings naming a CounterStore whose counters every worker must share
+COUNTER_STORE_SETTINGS = ("API_QUOTA_COUNTER_STORE", "THROTTLE_COUNTER_STORE")
+
+# Cache backends whose data never leaves the process
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_counter_stores(app_configs, **kwargs):
+    """Rate limits kept in a process-local cache multiply with the number of workers."""
+    from core.ratelimit import CacheCounterStore
+
+    errors = []
+    for name in COUNTER_STORE_SETTINGS:
+        path = getattr(settings, name, None)
+        if not path:
+            continue
+        try:
+            store_class = import_string(path)
+        except ImportError as e:
+            errors.append(Error(f"{name} cannot be imported: {e}", id="core.E001"))
+            continue
+        if not issubclass(store_class, CacheCounterStore):
+            continue
+        backend = settings.CACHES.get(store_class().alias, {}).get("BACKEND")
+        if backend in PROCESS_LOCAL_CACHES:
+            errors.append(Error(
+                f"{name} keeps counters in the '{store_class().alias}' cache, which uses the "
+                f"process-local {backend.rsplit('.', 1)[-1]}; every worker would enforce its own limits.",
+                hint="Use core.ratelimit.SQLiteCounterStore, or a shared cache backend such as Redis.",
+                id="core.E002",
+            ))
+    return errors
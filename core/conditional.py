@@ -0,0 +1,115 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# =========================================================
+# ConditionalGetMixin – ETag / Last-Modified before serialization
+# =========================================================
+class ConditionalGetMixin:
+    """
+    Answers ``If-None-Match`` / ``If-Modified-Since`` on ``conditional_actions``
+    with a 304 before the queryset is serialized.
+
+    Validators come from aggregate queries over the rows behind the response:
+    ``max(updated_at)`` and the row count of the (filtered) queryset, of the
+    forward relations in ``conditional_related`` and, for ``retrieve``, of the
+    child tables in ``conditional_children`` (``(model, fk_name)`` pairs,
+    counted with soft-deleted rows so deletes change the validators). With a
+    ``response_cache`` (see CachedResponseMixin) the validators sent on 200
+    responses are cached under its version. Requests carrying
+    ``If-None-Match`` / ``If-Modified-Since`` always read them from the
+    database: a 304 tells the client its copy is current, so it must never
+    come from a version this process has not re-read yet.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    conditional_related = ()
+    conditional_children = ()
+    validators = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD") or self.action not in self.conditional_actions:
+            return
+        self.validators = self.get_validators(request, *args, **kwargs)
+        if self.validators is None:
+            return
+        etag, last_modified = self.validators
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+        )
+        if not_modified is not None:
+            setattr(self, request.method.lower(), lambda request, *args, **kwargs: not_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.validators is not None and response.status_code in (200, 304):
+            etag, last_modified = self.validators
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    # ---------------------------------
+    # Validators
+    # ---------------------------------
+    def get_validators(self, request, *args, **kwargs):
+        """``(strong etag, last modified)``, or None when the object does not exist."""
+        cache = getattr(self, "response_cache", None)
+        key = None
+        if cache is not None:
+            digest = hashlib.md5(self.validator_seed(request).encode()).hexdigest()
+            key = f"{cache.namespace}:validators:{cache.version()}:{digest}"
+            cached = None if is_conditional(request) else cache.cache.get(key)
+            if cached is not None:
+                return cached or None
+
+        state = self.get_validator_state(request, *args, **kwargs)
+        validators = None
+        if state is not None:
+            last_modified, fingerprint = state
+            raw = f"{self.validator_seed(request)}|{last_modified.isoformat() if last_modified else ''}|{fingerprint}"
+            validators = (quote_etag(hashlib.sha1(raw.encode()).hexdigest()), last_modified)
+        if key is not None:
+            cache.cache.set(key, validators or (), cache.timeout)
+        return validators
+
+    def validator_seed(self, request):
+        renderer = getattr(request, "accepted_renderer", None)
+        # Same body, same ETag: absolute URLs in it depend on scheme and host
+        url = f"{request.scheme}://{request.get_host()}{request.get_full_path()}"
+        return f"{url}|{getattr(renderer, 'media_type', '')}"
+
+    def get_validator_state(self, request, *args, **kwargs):
+        """``(max updated_at, fingerprint)`` of everything the response renders."""
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+
+        aggregates = {"last": Max("updated_at"), "rows": Count("pk")}
+        for path in self.conditional_related:
+            aggregates[f"last_{path}"] = Max(f"{path}__updated_at")
+        if self.action == "retrieve":
+            state = queryset.values("pk").annotate(**aggregates).first()
+            if state is None:
+                return None
+        else:
+            state = queryset.aggregate(**aggregates)
+
+        stamps = [state.pop("last")] + [state.pop(f"last_{path}") for path in self.conditional_related]
+        fingerprint = [state["rows"]]
+        if self.action == "retrieve":
+            for model, fk_name in self.conditional_children:
+                child = model.all_objects.filter(**{fk_name: state["pk"]}).aggregate(
+                    last=Max("updated_at"), rows=Count("pk")
+                )
+                stamps.append(child["last"])
+                fingerprint.append(child["rows"])
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        return (max(stamps) if stamps else None), ":".join(map(str, fingerprint))
+
+
+def is_conditional(request):
+    return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
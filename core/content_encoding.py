@@ -0,0 +1,53 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without the brotli package
+    brotli = None
+
+# Preferred first when the client weights encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` from an Accept-Encoding header (codings lowercased)."""
+    weights = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def choose_encoding(header, available=SUPPORTED_ENCODINGS):
+    """
+    Best of ``available`` for an Accept-Encoding header, or None for the
+    identity encoding. Ties keep the order of ``available``.
+    """
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data, coding, gzip_level=6, brotli_quality=5):
+    if coding == "gzip":
+        # mtime=0 keeps the output (and anything hashed from it) deterministic
+        return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+    if coding == "br" and brotli is not None:
+        return brotli.compress(data, quality=brotli_quality)
+    raise ValueError(f"Unsupported content encoding '{coding}'")
@@ -0,0 +1,83 @@
+import csv
+import json
+import uuid
+from datetime import date
+from decimal import Decimal
+from django.db.models import F, JSONField, TextField
+from django.db.models.functions import Cast
+from django.http import HttpResponse, StreamingHttpResponse
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+# -------------------------------
+# Streaming CSV / NDJSON Export
+# -------------------------------
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer."""
+    def write(self, value):
+        return value
+
+
+def _to_json(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_to_json)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _csv_rows(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in columns])
+    for row in rows:
+        yield writer.writerow([_csv_cell(row[path]) for _, path in columns])
+
+
+def _ndjson_rows(rows, columns):
+    for row in rows:
+        yield json.dumps({header: row[path] for header, path in columns}, default=_to_json) + "\n"
+
+
+def stream_export(queryset, columns, export_format="csv", filename="export", chunk_size=2000):
+    """
+    Stream ``queryset`` as CSV or NDJSON. ``columns`` is a list of
+    ``(header, lookup path)`` pairs; rows are fetched with ``values()`` and a
+    server-side ``iterator()`` so memory stays flat however many rows match.
+    """
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValueError(f"Unsupported export format '{export_format}'. Use one of: {', '.join(EXPORT_CONTENT_TYPES)}")
+    rows = queryset.values(*[path for _, path in columns]).iterator(chunk_size=chunk_size)
+    generate = _csv_rows if export_format == "csv" else _ndjson_rows
+    response = StreamingHttpResponse(generate(rows, columns), content_type=EXPORT_CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+# -------------------------------
+# Single large column
+# -------------------------------
+def column_response(queryset, column, content_type):
+    """
+    ``column`` of the first row of ``queryset`` as the whole response body,
+    or None when no row matches. Only that column is selected, and JSON
+    columns are read as their stored text, so the payload is never decoded
+    and re-encoded. The body is a plain (not streaming) response so
+    CompressionMiddleware can compress it.
+    """
+    field = queryset.model._meta.get_field(column)
+    value = Cast(column, output_field=TextField()) if isinstance(field, JSONField) else F(column)
+    rows = list(queryset.order_by().annotate(_column=value).values_list("_column", flat=True)[:1])
+    if not rows:
+        return None
+    return HttpResponse(rows[0] or "", content_type=content_type)
@@ -0,0 +1,194 @@
+import threading
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+# (DRF field, model fields) pairs where to_representation() returns the
+# value straight from values_list() unchanged
+IDENTITY_FIELDS = (
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.IntegerField, (models.IntegerField,)),
+    (serializers.BooleanField, (models.BooleanField,)),
+    (serializers.JSONField, (models.JSONField,)),
+)
+
+# =========================================================
+# FastSerializer – compiled values() rendering of a ModelSerializer
+# =========================================================
+class FastSerializer:
+    """
+    Read-only rendering path for a ModelSerializer: the serializer's fields
+    are compiled once into a plan (the ``values_list()`` columns to fetch
+    and a generated function turning each row tuple into the same dict the
+    serializer would produce), so a list page skips model instantiation,
+    ``get_attribute()`` and per-field dispatch.
+
+    Plans are cached per resolved field set, so ``?fields=``/``?expand=``
+    values naming no real field share one plan; the default plan is
+    compiled when the FastSerializer is created. At most ``max_plans``
+    field sets get a plan, later ones take the regular serializer path.
+    Serializers with fields that cannot be mapped to columns (methods,
+    properties, files, to-many relations, ``*`` sources) have no plan, and
+    ``plan_for()`` returns None.
+    """
+
+    def __init__(self, serializer_class, max_plans=32):
+        self.serializer_class = serializer_class
+        self.max_plans = max_plans
+        self._plans = {}
+        self._lock = threading.Lock()
+        self.default_plan = self.plan_for(serializer_class())
+
+    def plan_for(self, serializer):
+        """The compiled plan for a serializer instance's (bound) field set."""
+        key = field_signature(serializer)
+        with self._lock:
+            if key not in self._plans:
+                if len(self._plans) >= self.max_plans:
+                    return None
+                self._plans[key] = compile_plan(serializer, serializer.Meta.model)
+            return self._plans[key]
+
+
+def field_signature(serializer):
+    """Hashable shape of a serializer's readable fields, nested serializers included."""
+    return tuple(
+        (
+            name, type(field), field.source,
+            field_signature(field) if isinstance(field, serializers.Serializer) else None,
+        )
+        for name, field in serializer.fields.items()
+        if not field.write_only
+    )
+
+
+class CompiledPlan:
+    def __init__(self, columns, source):
+        self.columns = columns
+        self.source = source
+
+    def rows(self, queryset, extra=()):
+        """``queryset`` as named row tuples holding the plan's columns (plus ``extra``)."""
+        columns = list(self.columns) + [column for column in extra if column not in self.columns]
+        return queryset.values_list(*columns, named=True)
+
+    def render(self, rows):
+        return self._render(rows)
+
+
+def compile_plan(serializer, model):
+    columns = []
+    converters = {}
+
+    def column(path):
+        if path not in columns:
+            columns.append(path)
+        return columns.index(path)
+
+    def expression(field, model, prefix):
+        """Python expression rendering ``field`` from row ``r``, or None if unsupported."""
+        if field.source == "*" or isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            return None
+        attrs = field.source_attrs
+        model_field = resolve_field(model, attrs)
+        if model_field is None or model_field.many_to_many or model_field.one_to_many:
+            return None
+        path = prefix + "__".join(attrs)
+
+        if isinstance(field, serializers.ModelSerializer):
+            if len(attrs) > 1:
+                return None
+            items = dict_expression(field, model_field.related_model, f"{path}__")
+            if items is None:
+                return None
+            return f"(None if r[{column(path)}] is None else {items})"
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Renders the raw key, exactly like PKOnlyObject.pk
+            return f"r[{column(path)}]" if len(attrs) == 1 else None
+        if isinstance(field, (serializers.RelatedField, serializers.FileField, serializers.SerializerMethodField)):
+            return None
+        if not model_field.concrete or model_field.is_relation:
+            return None
+
+        index = column(path)
+        for field_class, model_classes in IDENTITY_FIELDS:
+            if isinstance(field, field_class) and isinstance(model_field, model_classes):
+                if not getattr(field, "binary", False):
+                    return f"r[{index}]"
+        name = f"_c{len(converters)}"
+        converters[name] = field.to_representation
+        return f"(None if r[{index}] is None else {name}(r[{index}]))"
+
+    def dict_expression(serializer, model, prefix):
+        items = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            value = expression(field, model, prefix)
+            if value is None:
+                return None
+            items.append(f"{name!r}: {value}")
+        return "{" + ", ".join(items) + "}"
+
+    body = dict_expression(serializer, model, "")
+    if body is None:
+        return None
+    source = f"def _render(rows):\n    return [{body} for r in rows]\n"
+    namespace = dict(converters)
+    exec(compile(source, f"<fast serializer {type(serializer).__name__}>", "exec"), namespace)
+    plan = CompiledPlan(columns, source)
+    plan._render = namespace["_render"]
+    return plan
+
+# =========================================================
+# FastListMixin – use the compiled plan in list()
+# =========================================================
+class FastListMixin:
+    """
+    Viewset side of FastSerializer: ``fast_serializer`` renders list pages
+    from ``values_list()`` rows when a plan exists for the requested field
+    set; anything else (no plan, search highlights) takes the regular
+    serializer path. List methods call ``fast_list_queryset()`` before
+    paginating and ``serialize_page()`` after.
+    """
+
+    fast_serializer = None
+    fast_plan = None
+
+    def fast_list_queryset(self, queryset):
+        self.fast_plan = None
+        if self.fast_serializer is None or getattr(self.request, "search_hits", None):
+            return queryset
+        plan = self.fast_serializer.plan_for(self.get_serializer())
+        if plan is None:
+            return queryset
+        self.fast_plan = plan
+        # Pagination reads the pk and the ordering column from each row
+        extra = ["pk"] + [
+            name for name in [getattr(self, "keyset_field", None), *getattr(self, "ordering_fields", [])]
+            if name and _is_column(queryset.model, name)
+        ]
+        return plan.rows(queryset, extra=extra)
+
+    def serialize_page(self, page):
+        if self.fast_plan is not None:
+            return self.fast_plan.render(page)
+        return self.get_serializer(page, many=True).data
+
+
+def resolve_field(model, attrs):
+    """Model field reached by a serializer source such as ``subscription.user.username``."""
+    field = None
+    for index, attr in enumerate(attrs):
+        if index and (field is None or not field.is_relation or field.related_model is None):
+            return None
+        try:
+            field = (field.related_model if index else model)._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+    return field
+
+
+def _is_column(model, name):
+    field = resolve_field(model, [name])
+    return field is not None and field.concrete
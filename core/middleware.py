@@ -0,0 +1,95 @@
+import re
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from core.content_encoding import SUPPORTED_ENCODINGS, choose_encoding, compress
+
+# Content types worth compressing (JSON, text, XML, JavaScript)
+COMPRESSIBLE_TYPES = re.compile(r"^(text/|application/(json|javascript|xml)|application/[\w.+-]+\+(json|xml))")
+
+# =========================================================
+# CompressionMiddleware – gzip / brotli response bodies
+# =========================================================
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best encoding the client accepts
+    (brotli when installed, else gzip). Bodies under ``COMPRESSION_MIN_SIZE``,
+    streaming responses, responses that already carry a Content-Encoding
+    (e.g. the pre-compressed catalog snapshot) or ``Cache-Control:
+    no-transform``, and non-text content types go out unchanged.
+
+    Responses stored or served by a VersionedResponseCache (``cache_key``)
+    are compressed once per encoding: the compressed bytes are cached under
+    the same key and version, so cache hits skip compression entirely.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        self.gzip_level = getattr(settings, "COMPRESSION_GZIP_LEVEL", 6)
+        self.brotli_quality = getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        coding = self.negotiate(request, response)
+        if coding is None:
+            return response
+        return self.compress_response(response, coding)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        coding = self.negotiate(request, response)
+        if coding is None:
+            return response
+        # Compression (and a possibly remote cache) stays off the event loop
+        return await sync_to_async(self.compress_response, thread_sensitive=False)(response, coding)
+
+    def negotiate(self, request, response):
+        """Content coding to apply to ``response``, or None to send it as is."""
+        if response.streaming or response.has_header("Content-Encoding"):
+            return None
+        if len(response.content) < self.min_size:
+            return None
+        if not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return None
+        if "no-transform" in response.get("Cache-Control", ""):
+            return None
+        # From here on the body depends on Accept-Encoding, compressed or not
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), SUPPORTED_ENCODINGS)
+
+    def compress_response(self, response, coding):
+        cache = getattr(response, "response_cache", None)
+        key = getattr(response, "cache_key", None)
+        content = None
+        if cache is not None and key:
+            try:
+                content = cache.get_encoded(key, coding)
+            except Exception as e:
+                print(f"[CompressionMiddleware] Failed to read compressed body: {e}")
+        if content is None:
+            content = compress(
+                response.content, coding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality
+            )
+            if cache is not None and key:
+                try:
+                    cache.set_encoded(key, coding, content)
+                except Exception as e:
+                    print(f"[CompressionMiddleware] Failed to cache compressed body: {e}")
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response["Content-Length"] = str(len(content))
+        response["Content-Encoding"] = coding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # The compressed bytes differ from the identity representation
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,152 @@
+import base64
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# -------------------------------
+# Keyset (cursor) Pagination
+# -------------------------------
+class KeysetPagination(BasePagination):
+    """
+    Seek-based pagination on ``(keyset_field, pk)``.
+
+    Instead of ``COUNT(*)`` + ``OFFSET`` every page is a range scan starting
+    after the last row of the previous one, so page 1000 costs the same as
+    page 1. Cursors are opaque base64 tokens carrying that last row's key.
+
+    Views choose the key with ``keyset_field`` (default ``created_at``,
+    newest first); ``?ordering=`` may pick any of ``keyset_fields`` (or the
+    view's ``ordering_fields``), all of which must be non-null columns.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    keyset_field = "created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_keyset(request, view)
+        model_field = queryset.model._meta.get_field(self.field)
+
+        cursor = self.decode_cursor(request, model_field)
+        backwards = bool(cursor and cursor["reverse"])
+        # Walking backwards flips the scan order; results are flipped back below
+        descending = self.descending != backwards
+
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}pk")
+        if cursor:
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": cursor["value"]})
+                | Q(**{self.field: cursor["value"], f"pk__{lookup}": cursor["pk"]})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+
+        self.next_key = self.previous_key = None
+        if rows:
+            first, last = self.key_for(rows[0]), self.key_for(rows[-1])
+            if backwards:
+                self.previous_key = first if has_more else None
+                self.next_key = last
+            else:
+                self.previous_key = first if cursor else None
+                self.next_key = last if has_more else None
+        elif cursor:
+            # Ran off the end; let the client step back towards the data
+            key = (cursor["value"], cursor["pk"])
+            self.previous_key, self.next_key = (None, key) if backwards else (key, None)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ---------------------------------
+    # Helpers
+    # ---------------------------------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_keyset(self, request, view):
+        default = getattr(view, "keyset_field", self.keyset_field)
+        allowed = getattr(view, "keyset_fields", None) or [default, *getattr(view, "ordering_fields", [])]
+        ordering = request.query_params.get(self.ordering_query_param, "").split(",")[0].strip()
+        if ordering.lstrip("-") in allowed:
+            return ordering.lstrip("-"), ordering.startswith("-")
+        return default, True
+
+    def key_for(self, obj):
+        return getattr(obj, self.field), obj.pk
+
+    def get_next_link(self):
+        return self.encode_link(self.next_key, reverse=False)
+
+    def get_previous_link(self):
+        return self.encode_link(self.previous_key, reverse=True)
+
+    def encode_link(self, key, reverse):
+        if key is None:
+            return None
+        value, pk = key
+        payload = {
+            "f": self.field,
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "pk": str(pk),
+            "r": reverse,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token.rstrip("="))
+
+    def decode_cursor(self, request, model_field):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            if payload["f"] != self.field:
+                raise ValueError("cursor belongs to a different ordering")
+            return {
+                "value": model_field.to_python(payload["v"]),
+                "pk": payload["pk"],
+                "reverse": bool(payload.get("r")),
+            }
+        except (KeyError, TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_html(self):
+        return ""
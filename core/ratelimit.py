@@ -0,0 +1,333 @@
+import calendar
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+RateLimitDecision = namedtuple("RateLimitDecision", "allowed limit remaining reset_after retry_after")
+
+# =========================================================
+# Counter stores – shared integer state for the limiters
+# =========================================================
+class CounterStore:
+    """
+    Integer counters with expiry. ``incr`` must be atomic across every
+    process that enforces the same limits; it creates missing keys.
+    """
+
+    def incr(self, key, delta=1, ttl=None):
+        raise NotImplementedError
+
+    def get(self, key, default=0):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+
+class CacheCounterStore(CounterStore):
+    """
+    Counters in a Django cache. Shared across gunicorn workers when the
+    cache backend is shared (Redis, Memcached); LocMemCache only covers
+    one process.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def incr(self, key, delta=1, ttl=None):
+        cache = self.cache
+        if cache.add(key, delta, ttl):
+            return delta
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, delta, ttl)
+            return delta
+
+    def get(self, key, default=0):
+        return self.cache.get(key, default)
+
+    def set(self, key, value, ttl=None):
+        self.cache.set(key, value, ttl)
+
+
+class LocalCounterStore(CounterStore):
+    """In-process counters; for tests and single-process servers."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key, delta=1, ttl=None):
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._data.get(key, (0, None))
+            if key not in self._data or expires is not None and expires <= now:
+                value, expires = 0, now + ttl if ttl is not None else None
+            value += delta
+            self._data[key] = (value, expires)
+            return value
+
+    def get(self, key, default=0):
+        with self._lock:
+            value, expires = self._data.get(key, (default, None))
+            if expires is not None and expires <= time.monotonic():
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCounterStore(CounterStore):
+    """
+    Counters in a SQLite database in WAL mode, shared by every worker
+    process on the host without a cache server. Each ``incr`` is a single
+    upsert in an immediate transaction, so it is atomic across processes;
+    expired rows are reset on write and purged every ``purge_every`` writes.
+    """
+
+    purge_every = 1000
+
+    def __init__(self, path=None):
+        self.path = str(path or getattr(settings, "COUNTER_STORE_PATH", "counters.sqlite3"))
+        self._local = threading.local()
+        self._writes = 0
+
+    @property
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            # Connections must not cross fork() into gunicorn workers
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def incr(self, key, delta=1, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END, "
+                "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END",
+                (key, delta, expires_at, now, now),
+            )
+            value = conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._maybe_purge(now)
+        return value
+
+    def get(self, key, default=0):
+        row = self.connection.execute(
+            "SELECT value FROM counters WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else default
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO counters (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl if ttl is not None else None),
+        )
+        self._maybe_purge(now)
+
+    def _maybe_purge(self, now):
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self.connection.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+
+# =========================================================
+# Limiters
+# =========================================================
+class GCRALimiter:
+    """
+    ``limit`` requests per ``period`` seconds (bursts up to ``limit``) using
+    the generic cell rate algorithm. The only state is the theoretical
+    arrival time (TAT) in milliseconds, advanced with one atomic ``incr``
+    per request, so no read-modify-write race exists between workers.
+    A stale TAT is reset with ``set``; concurrent resets can each admit one
+    extra request, never more.
+    """
+
+    state_ttl = 86400
+
+    def __init__(self, limit, period=60):
+        self.limit = limit
+        self.period_ms = period * 1000
+        self.interval_ms = max(1, self.period_ms // limit)
+
+    def hit(self, store, key, now=None):
+        now_ms = int((time.time() if now is None else now) * 1000)
+        tat = store.incr(key, self.interval_ms, ttl=self.state_ttl)
+        if tat - self.interval_ms < now_ms:
+            tat = now_ms + self.interval_ms
+            store.set(key, tat, ttl=self.state_ttl)
+
+        if tat > now_ms + self.period_ms:
+            store.incr(key, -self.interval_ms, ttl=self.state_ttl)
+            retry_after = (tat - self.period_ms - now_ms) / 1000
+            reset_after = (tat - self.interval_ms - now_ms) / 1000
+            return RateLimitDecision(False, self.limit, 0, reset_after, retry_after)
+
+        remaining = (now_ms + self.period_ms - tat) // self.interval_ms
+        return RateLimitDecision(True, self.limit, remaining, (tat - now_ms) / 1000, 0)
+
+    def undo(self, store, key, now=None):
+        store.incr(key, -self.interval_ms, ttl=self.state_ttl)
+
+
+class QuotaLimiter:
+    """
+    ``limit`` requests per calendar ``window`` ("day" or "month", local
+    time): one counter per window, so a cap resets at midnight or on the
+    first of the month rather than sliding.
+    """
+
+    def __init__(self, limit, window="day"):
+        if window not in ("day", "month"):
+            raise ValueError(f"Unknown quota window '{window}'")
+        self.limit = limit
+        self.window = window
+
+    def bounds(self, now=None):
+        """``(window id, seconds until the window resets)``."""
+        current = timezone.localtime(datetime.fromtimestamp(now, tz=dt_timezone.utc) if now is not None else None)
+        start = current.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.window == "day":
+            return f"{start:%Y%m%d}", (start + timedelta(days=1) - current).total_seconds()
+        days = calendar.monthrange(start.year, start.month)[1]
+        end = start.replace(day=1) + timedelta(days=days)
+        return f"{start:%Y%m}", (end - current).total_seconds()
+
+    def hit(self, store, key, now=None):
+        window_id, reset_after = self.bounds(now)
+        ttl = math.ceil(reset_after) + 3600
+        used = store.incr(f"{key}:{window_id}", 1, ttl=ttl)
+        if used > self.limit:
+            store.incr(f"{key}:{window_id}", -1, ttl=ttl)
+            return RateLimitDecision(False, self.limit, 0, reset_after, reset_after)
+        return RateLimitDecision(True, self.limit, self.limit - used, reset_after, 0)
+
+    def undo(self, store, key, now=None):
+        window_id, reset_after = self.bounds(now)
+        store.incr(f"{key}:{window_id}", -1, ttl=math.ceil(reset_after) + 3600)
+
+
+class SlidingWindowLimiter:
+    """
+    ``limit`` requests per ``period`` seconds estimated from two fixed-window
+    counters: the current window plus the previous one weighted by how much
+    of it still overlaps the sliding window. Constant state (two integers)
+    and two store round trips per check, whatever the rate.
+    """
+
+    def __init__(self, limit, period):
+        self.limit = limit
+        self.period = period
+
+    def windows(self, now):
+        index, offset = divmod(now, self.period)
+        return int(index), offset / self.period
+
+    def hit(self, store, key, now=None):
+        now = time.time() if now is None else now
+        index, elapsed = self.windows(now)
+        current_key = f"{key}:{index}"
+        previous = store.get(f"{key}:{index - 1}", 0)
+        current = store.incr(current_key, 1, ttl=2 * self.period)
+        weight = 1 - elapsed
+        used = previous * weight + current
+        if used > self.limit:
+            store.incr(current_key, -1, ttl=2 * self.period)
+            return RateLimitDecision(
+                False, self.limit, 0, self.period * (1 - elapsed), self.retry_after(previous, current - 1, elapsed)
+            )
+        remaining = int(self.limit - used)
+        return RateLimitDecision(True, self.limit, remaining, self.period * (1 - elapsed), 0)
+
+    def retry_after(self, previous, current, elapsed):
+        """Seconds until one more request fits the estimate."""
+        if current + 1 > self.limit:
+            # Only the next window helps; its previous weight then decays too
+            needed = 1 - (self.limit - 1) / current if current else 0
+            return self.period * (1 - elapsed + max(0, needed))
+        if not previous:
+            return 0
+        needed = 1 - (self.limit - current - 1) / previous
+        return max(0, self.period * (needed - elapsed))
+
+    def undo(self, store, key, now=None):
+        index, _ = self.windows(time.time() if now is None else now)
+        store.incr(f"{key}:{index}", -1, ttl=2 * self.period)
+
+
+class RateLimiter:
+    """
+    Applies several named limiters to one key. A request is admitted only
+    if all of them admit it; when one rejects, the ones that already counted
+    it are rolled back. Returns the decision of the tightest limiter.
+    """
+
+    def __init__(self, limiters, store, prefix="ratelimit"):
+        self.limiters = limiters
+        self.store = store
+        self.prefix = prefix
+
+    def check(self, key, now=None):
+        now = time.time() if now is None else now
+        granted = []
+        tightest = None
+        for name, limiter in self.limiters.items():
+            limiter_key = f"{self.prefix}:{name}:{key}"
+            decision = limiter.hit(self.store, limiter_key, now)
+            if not decision.allowed:
+                for granted_key, granted_limiter in granted:
+                    granted_limiter.undo(self.store, granted_key, now)
+                return decision
+            granted.append((limiter_key, limiter))
+            if tightest is None or decision.remaining < tightest.remaining:
+                tightest = decision
+        return tightest
+
+
+def rate_limit_headers(decision):
+    headers = {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(max(0, decision.remaining)),
+        "X-RateLimit-Reset": str(math.ceil(decision.reset_after)),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
@@ -0,0 +1,43 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to DRF's stdlib json rendering
+    orjson = None
+
+# =========================================================
+# FastJSONRenderer – orjson with DRF's output
+# =========================================================
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that encodes with orjson when it is installed.
+    Datetimes (UTC as ``Z``), dates, times and UUIDs are encoded natively;
+    everything else orjson does not know (Decimal, lazy strings, querysets,
+    named tuples...) goes through DRF's own encoder ``default()``. Indented
+    output (browsable API, ``; indent=``) and data orjson rejects (e.g.
+    integers beyond 64 bits) use the stdlib path.
+
+    The output parses to the same values as ``JSONRenderer``'s, and the
+    bytes match except for floats: exponents are written without sign or
+    padding (``1e16``, ``1e-7`` for ``1e+16``, ``1e-07``), small ones may be
+    written positionally (``0.000025``), and NaN/Infinity render as
+    ``null`` where DRF's strict JSON raises ValueError.
+    """
+
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # orjson always writes UTF-8, so ensure_ascii output needs the stdlib path
+        if orjson is None or self.ensure_ascii or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict javascript subset as JSONRenderer
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
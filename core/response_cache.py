@@ -0,0 +1,187 @@
+import hashlib
+import threading
+import time
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from rest_framework.response import Response
+from core.conditional import is_conditional
+
+# =========================================================
+# TableFingerprint – a version read from the database
+# =========================================================
+class TableFingerprint:
+    """
+    Version of a set of soft-delete models taken from the database: the row
+    count and latest ``updated_at`` of each table (``all_objects``, so soft
+    deletes and restores count), one aggregate query per table. Every
+    process sees the same value whatever the cache backend; it is memoized
+    for ``max_age`` seconds per process, and ``invalidate()`` drops the memo
+    so the process that made a change sees it at once.
+    """
+
+    def __init__(self, models, max_age=5):
+        self.models = models
+        self.max_age = max_age
+        self._value = None
+        self._checked_at = 0.0
+
+    def value(self):
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at >= self.max_age:
+            state = [
+                model.all_objects.aggregate(rows=Count("pk"), updated=Max("updated_at")) for model in self.models
+            ]
+            self._value = hashlib.sha1(repr(state).encode()).hexdigest()
+            self._checked_at = now
+        return self._value
+
+    def invalidate(self):
+        self._value = None
+
+# =========================================================
+# VersionedResponseCache – rendered responses under a version
+# =========================================================
+class VersionedResponseCache:
+    """
+    Stores fully rendered GET responses keyed by scheme, host, path, query
+    string, media type and a namespace-wide version. Changing the version
+    orphans every stored response at once; orphans simply age out with
+    ``timeout``. Only the cache API is used, so any backend works (LocMem,
+    file, Redis...). Hit/miss counters are per process.
+
+    With a ``fingerprint`` (TableFingerprint) the version comes from the
+    database, so changes made by any process reach every process within
+    its ``max_age``, even with a per-process backend. Without one the
+    version is a counter in the cache, bumped with one ``incr``, which only
+    reaches other processes through a shared backend.
+
+    Responses it stores or serves carry ``cache_key`` and ``response_cache``
+    so compressed copies of the body can be cached next to it.
+    """
+
+    def __init__(self, namespace, alias="default", timeout=300, fingerprint=None):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def version_key(self):
+        return f"{self.namespace}:version"
+
+    def version(self):
+        if self.fingerprint is not None:
+            return self.fingerprint.value()
+        version = self.cache.get(self.version_key)
+        if version is None:
+            # Start from the clock so a lost key never revives old entries
+            self.cache.add(self.version_key, int(time.time() * 1000), None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def bump(self):
+        if self.fingerprint is not None:
+            self.fingerprint.invalidate()
+            return self.fingerprint.value()
+        try:
+            return self.cache.incr(self.version_key)
+        except ValueError:
+            self.version()
+            return self.cache.get(self.version_key)
+
+    def key_for(self, request, version):
+        media_type = getattr(getattr(request, "accepted_renderer", None), "media_type", "")
+        # Bodies may embed absolute URLs (build_absolute_uri), so host and scheme are part of the key
+        seed = f"{request.scheme}://{request.get_host()}{request.get_full_path()}|{media_type}"
+        digest = hashlib.md5(seed.encode()).hexdigest()
+        return f"{self.namespace}:response:{version}:{digest}"
+
+    def get(self, key):
+        entry = self.cache.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        status, content_type, content = entry
+        response = HttpResponse(content, status=status, content_type=content_type)
+        response.cache_key, response.response_cache = key, self
+        return response
+
+    def set(self, key, response):
+        self.cache.set(key, (response.status_code, response["Content-Type"], response.content), self.timeout)
+        response.cache_key, response.response_cache = key, self
+
+    # ---------------------------------
+    # Encoded bodies (see core.middleware.CompressionMiddleware)
+    # ---------------------------------
+    def get_encoded(self, key, coding):
+        """The stored response body under ``key`` compressed with ``coding``, if cached."""
+        return self.cache.get(f"{key}:{coding}")
+
+    def set_encoded(self, key, coding, content):
+        # Same key and version as the body, so a bump orphans both
+        self.cache.set(f"{key}:{coding}", content, self.timeout)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+
+class CachedResponseMixin:
+    """
+    Serves ``cached_actions`` of a viewset from ``response_cache``. The
+    lookup runs at the end of ``initial()``, i.e. after DRF authentication,
+    permission and throttle checks; a hit replaces the action handler for
+    this request. Only successful JSON responses are stored; the browsable
+    API embeds per-user content and is never cached.
+    """
+
+    response_cache = None
+    cached_actions = ("list", "retrieve")
+    cacheable_formats = ("json",)
+    response_cache_key = None
+
+    def is_cacheable(self, request):
+        renderer = getattr(request, "accepted_renderer", None)
+        return (
+            self.response_cache is not None
+            and request.method == "GET"
+            and self.action in self.cached_actions
+            and getattr(renderer, "format", None) in self.cacheable_formats
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not self.is_cacheable(request):
+            return
+        # Read the version first: a bump while rendering only orphans this entry
+        self.response_cache_key = self.response_cache.key_for(request, self.response_cache.version())
+        # A revalidating client gets fresh validators (ConditionalGetMixin), so it must get a fresh body too
+        cached = None if is_conditional(request) else self.response_cache.get(self.response_cache_key)
+        if cached is not None:
+            cached["X-Cache"] = "HIT"
+            self.response_cache_key = None
+            setattr(self, request.method.lower(), lambda request, *args, **kwargs: cached)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.response_cache_key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            self.response_cache.set(self.response_cache_key, response)
+            response["X-Cache"] = "MISS"
+        return response
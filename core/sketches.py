@@ -0,0 +1,72 @@
+import math
+from collections import Counter
+
+# -------------------------------
+# Mergeable Quantile Sketch
+# -------------------------------
+class LatencySketch:
+    """
+    Log-bucketed histogram (DDSketch style) for latencies in milliseconds.
+
+    A value ``v`` falls in bucket ``ceil(log(v) / log(gamma))``, so every
+    quantile is answered within ``RELATIVE_ACCURACY`` of the true value.
+    Sketches are merged by adding bucket counts, which lets the database do
+    the heavy lifting with a plain GROUP BY on the stored bucket index.
+    Values up to 1 ms share bucket 0.
+    """
+
+    RELATIVE_ACCURACY = 0.02
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(GAMMA)
+
+    def __init__(self, buckets=None):
+        self.buckets = Counter()
+        if buckets:
+            for bucket, count in buckets.items():
+                self.buckets[int(bucket)] += count
+
+    @classmethod
+    def bucket_for(cls, value_ms):
+        if value_ms is None or value_ms <= 1:
+            return 0
+        return math.ceil(math.log(value_ms) / cls._LOG_GAMMA)
+
+    @classmethod
+    def value_for(cls, bucket):
+        """Representative value of a bucket (its relative-error midpoint)."""
+        if bucket <= 0:
+            return 1.0
+        return 2 * cls.GAMMA ** bucket / (cls.GAMMA + 1)
+
+    @property
+    def count(self):
+        return sum(self.buckets.values())
+
+    def add(self, value_ms, count=1):
+        self.buckets[self.bucket_for(value_ms)] += count
+
+    def add_bucket(self, bucket, count=1):
+        self.buckets[int(bucket)] += count
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        return self
+
+    def quantile(self, q):
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                return round(self.value_for(bucket), 2)
+        return round(self.value_for(max(self.buckets)), 2)
+
+    def to_dict(self):
+        return {str(bucket): count for bucket, count in self.buckets.items() if count}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
@@ -0,0 +1,217 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import SAFE_METHODS
+from core.exports import column_response
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_field_tree(value):
+    """``"id,api.name,api.category"`` -> ``{"id": {}, "api": {"name": {}, "category": {}}}``."""
+    tree = {}
+    for item in value.split(","):
+        node = tree
+        for part in item.strip().split("."):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _subtree(tree, path):
+    for name in path:
+        if tree is None:
+            return None
+        tree = tree.get(name)
+    return tree
+
+# =========================================================
+# SparseFieldsetSerializerMixin – ?fields= / ?expand=
+# =========================================================
+class SparseFieldsetSerializerMixin:
+    """
+    Read-side sparse fieldsets driven by the request in the serializer
+    context. Without any of the following the output is unchanged.
+
+    * ``?fields=id,name,category.name`` keeps only the listed fields; a
+      nested object listed without sub-fields keeps all of its fields.
+    * ``?expand=api,api.category`` renders only the listed nested objects
+      in full; every other nested object collapses to its primary key (a
+      list of keys for to-many relations).
+    * ``context["sparse_exclude"]`` (dotted paths, set by the view) drops
+      fields, e.g. heavy columns on list pages.
+
+    Nested serializers need the mixin too for dotted paths to apply to them.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.sparse_spec()
+        if spec is None:
+            return fields
+        requested, expanded, excluded = spec
+        if requested:
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+        for name, subtree in (excluded or {}).items():
+            if not subtree:
+                fields.pop(name, None)
+        if expanded is not None:
+            for name, field in list(fields.items()):
+                if isinstance(field, serializers.BaseSerializer) and name not in expanded:
+                    fields[name] = collapse_nested(field)
+        return fields
+
+    def sparse_spec(self):
+        """
+        ``(requested, expanded, excluded)`` field trees at this serializer's
+        position, or None when the output is unrestricted.
+        """
+        root = self.root
+        if not hasattr(root, "_sparse_trees"):
+            root._sparse_trees = sparse_trees(root.context if hasattr(root, "context") else {})
+        if root._sparse_trees is None:
+            return None
+
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return tuple(_subtree(tree, path) for tree in root._sparse_trees)
+
+
+def sparse_trees(context):
+    """
+    ``(fields, expand, exclude)`` trees for a serializer context: the first
+    two from the request's query parameters, the last from
+    ``context["sparse_exclude"]``; None when all three are unset.
+    """
+    request = context.get("request")
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = getattr(request, "query_params", request.GET)
+    fields, expand, exclude = params.get(FIELDS_PARAM), params.get(EXPAND_PARAM), context.get("sparse_exclude")
+    if fields is None and expand is None and not exclude:
+        return None
+    return (
+        parse_field_tree(fields) if fields is not None else None,
+        parse_field_tree(expand) if expand is not None else None,
+        parse_field_tree(",".join(exclude)) if exclude else None,
+    )
+
+
+def collapse_nested(field):
+    """Primary key field(s) standing in for a nested serializer."""
+    if isinstance(field, serializers.ListSerializer):
+        return serializers.PrimaryKeyRelatedField(read_only=True, many=True, source=field.source)
+    return serializers.PrimaryKeyRelatedField(read_only=True, source=field.source)
+
+# =========================================================
+# SparseFieldsetViewMixin – load only what the serializer renders
+# =========================================================
+class SparseFieldsetViewMixin:
+    """
+    Narrows the filtered queryset of reads to the columns the (sparse)
+    serializer renders: ``only()`` over the selected fields,
+    ``select_related`` for expanded forward relations and the view's
+    prefetches for the to-many fields still rendered. Falls back to the
+    untouched queryset whenever a field's source cannot be mapped to model
+    fields (methods, properties, ``*``).
+
+    ``list_deferred_fields`` (dotted serializer paths) are left out of list
+    pages unless ``?fields=`` asks for them; ``column_response()`` serves
+    one of them for a single object from a sub-resource route.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    list_deferred_fields = ()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "list" and self.list_deferred_fields and FIELDS_PARAM not in self.request.query_params:
+            context["sparse_exclude"] = self.list_deferred_fields
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions:
+            return queryset
+        serializer = self.get_serializer()
+        if sparse_trees(serializer.context) is None:
+            return queryset
+        plan = load_plan(serializer, queryset.model)
+        if plan is None:
+            return queryset
+        only, related, prefetched = plan
+        lookups = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split("__")[0] in prefetched
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None).prefetch_related(*lookups)
+        if related:
+            # select_related() without arguments would follow every foreign key
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+    def column_response(self, column, content_type):
+        """Serve ``column`` of the object addressed by the URL (404 if there is none)."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            response = column_response(queryset, column, content_type)
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup values are a 404, as in get_object()
+            raise NotFound()
+        if response is None:
+            raise NotFound()
+        return response
+
+
+def load_plan(serializer, model, prefix=""):
+    """
+    ``(only() paths, select_related paths, to-many relation names)`` needed
+    to render ``serializer``, or None when that cannot be determined.
+    """
+    only, related, prefetched = [], [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            return None
+        attrs = field.source_attrs
+        try:
+            model_field = model._meta.get_field(attrs[0])
+        except FieldDoesNotExist:
+            return None
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if prefix:
+                # Nothing prefetches to-many relations of nested objects
+                return None
+            prefetched.append(attrs[0])
+            continue
+
+        path = prefix + "__".join(attrs)
+        if len(attrs) > 1:
+            # Dotted source such as "user.username"
+            related.append(prefix + "__".join(attrs[:-1]))
+            only.append(path)
+        elif isinstance(field, serializers.ModelSerializer):
+            nested = load_plan(field, model_field.related_model, prefix=f"{path}__")
+            if nested is None:
+                return None
+            only.append(path)
+            only.extend(nested[0])
+            related.append(path)
+            related.extend(nested[1])
+        elif isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            # StringRelatedField & co. need the whole related object
+            only.append(path)
+            related.append(path)
+        else:
+            only.append(path)
+    return only, related, prefetched
@@ -1,3 +1,30 @@
-from django.test import TestCase
+import json
+import unittest
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from core.renderers import FastJSONRenderer, orjson
 
-# Create your tests here.
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    """Where FastJSONRenderer's bytes match JSONRenderer's, and where they do not."""
+
+    def render(self, data):
+        return FastJSONRenderer().render(data), JSONRenderer().render(data)
+
+    def test_plain_data_matches(self):
+        fast, drf = self.render({"name": "café", "count": 3, "ratio": 0.1, "items": [1.0, None, True]})
+        self.assertEqual(fast, drf)
+
+    def test_exponent_floats_differ_in_text_only(self):
+        data = [1e16, 1e-7, 2.5e-5, 1e300]
+        fast, drf = self.render(data)
+        self.assertEqual(fast, b"[1e16,1e-7,0.000025,1e300]")
+        self.assertEqual(drf, b"[1e+16,1e-07,2.5e-05,1e+300]")
+        self.assertEqual(json.loads(fast), json.loads(drf))
+
+    def test_nan_and_infinity_render_as_null(self):
+        data = {"nan": float("nan"), "inf": float("inf")}
+        self.assertEqual(FastJSONRenderer().render(data), b'{"nan":null,"inf":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
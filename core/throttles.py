@@ -1,8 +1,71 @@
-from rest_framework.throttling import UserRateThrottle
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from core.ratelimit import SlidingWindowLimiter
 
-class LoginRateThrottle(UserRateThrottle):
+_stores = {}
+
+
+def get_throttle_store():
+    """Process-wide counter store for throttles (``THROTTLE_COUNTER_STORE``)."""
+    path = getattr(settings, "THROTTLE_COUNTER_STORE", "core.ratelimit.SQLiteCounterStore")
+    if path not in _stores:
+        _stores[path] = import_string(path)()
+    return _stores[path]
+
+# -------------------------------
+# Sliding-window throttling
+# -------------------------------
+class SlidingWindowThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's per-key timestamp list in the cache with
+    a sliding-window counter in a store shared by all workers on the host,
+    so a check costs the same at 1/min and 10000/min. Like QuotaMiddleware,
+    the throttle fails open when the store is unavailable (unwritable
+    ``COUNTER_STORE_PATH``, locked database...).
+    """
+
+    decision = None
+
+    def get_store(self):
+        return get_throttle_store()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        limiter = SlidingWindowLimiter(self.num_requests, self.duration)
+        try:
+            self.decision = limiter.hit(self.get_store(), f"throttle:{self.key}", self.now)
+        except Exception as e:
+            # Fail open; an unavailable counter store must not take the API down
+            print(f"[{type(self).__name__}] Failed to check throttle: {e}")
+            self.decision = None
+            return True
+        return self.decision.allowed
+
+    def wait(self):
+        if self.decision is None:
+            return None
+        return self.decision.retry_after or None
+
+
+class SlidingUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class SlidingAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class LoginRateThrottle(SlidingUserRateThrottle):
     """
     Custom throttle for login attempts.
     Limits number of login requests per user/IP.
     """
-    rate = "1/min"  
\ No newline at end of file
+    scope = "login"
+    rate = "1/min"
@@ -0,0 +1,55 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_db_timer = contextvars.ContextVar("db_timer", default=None)
+
+# -------------------------------
+# Per-request Database Timer
+# -------------------------------
+class DBTimer:
+    """Accumulates the time spent in database calls made inside ``track_db_time()``."""
+    __slots__ = ("seconds", "queries")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.queries = 0
+
+    @property
+    def milliseconds(self):
+        return self.seconds * 1000
+
+
+def timed_execute(execute, sql, params, many, context):
+    """Connection execute wrapper that charges query time to the active DBTimer."""
+    timer = _db_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - started
+        timer.queries += 1
+
+
+@receiver(connection_created)
+def install_db_timer(sender, connection, **kwargs):
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+@contextmanager
+def track_db_time():
+    """
+    Time database work done in this context. The timer travels in a context
+    variable, so queries run by ``sync_to_async`` views are counted too.
+    """
+    timer = DBTimer()
+    token = _db_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _db_timer.reset(token)
@@ -0,0 +1,75 @@
+import atexit
+import threading
+from django.db import close_old_connections, connections
+
+# -------------------------------
+# Periodic Background Flusher
+# -------------------------------
+class PeriodicFlusher:
+    """
+    Calls ``flush`` on a daemon thread every ``interval`` seconds, or sooner
+    when ``wake()`` is called. A final flush runs at interpreter shutdown.
+    """
+
+    def __init__(self, flush, interval, name="flusher"):
+        self.flush = flush
+        self.interval = interval
+        self.name = name
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._registered = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the worker thread (idempotent)."""
+        if self.running:
+            return
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            if not self._registered:
+                atexit.register(self.stop)
+                self._registered = True
+
+    def wake(self):
+        """Ask the worker to flush now instead of waiting for the interval."""
+        self._wakeup.set()
+
+    def stop(self, timeout=5):
+        """Stop the worker and run one last flush on the calling thread."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._safe_flush()
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+                if self._stopped.is_set():
+                    break
+                # Like a request: drop connections that broke or outlived CONN_MAX_AGE
+                close_old_connections()
+                try:
+                    self._safe_flush()
+                finally:
+                    close_old_connections()
+        finally:
+            connections.close_all()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[{self.name}] Flush failed: {e}")
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from accounts.models import User
 from core.models import BaseModel
@@ -13,11 +14,23 @@ class APIRequestLog(BaseModel):
     query_params = models.JSONField(default=dict, blank=True)
     response = models.JSONField(default=dict, blank=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Covers usage_count() bucket rebuilds: equality on user/endpoint, range on request_time
+            models.Index(
+                fields=["user", "endpoint", "request_time"],
+                name="logs_user_endpoint_time_idx",
+                condition=Q(is_deleted=False),
+            ),
+            # Keyset pages of the log lists
+            models.Index(fields=["-request_time", "-id"], name="logs_active_time_idx", condition=Q(is_deleted=False)),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.endpoint.name} - {self.status_code}"
 
     @staticmethod
     def usage_count(user, endpoint, days=30):
-        from django.utils import timezone
-        start = timezone.now() - timezone.timedelta(days=days)
-        return APIRequestLog.objects.filter(user=user, endpoint=endpoint, request_time__gte=start).count()
+        """Requests over the last ``days`` local days (today included), served from cached day buckets."""
+        from logs.usage_window import usage_window
+        return usage_window.count(getattr(user, "pk", user), getattr(endpoint, "pk", endpoint), days=days)
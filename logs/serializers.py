@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from logs.models import APIRequestLog
-from apis.serializers import APISerializer
 from accounts.serializers import UserSerializer
 
 class APIRequestLogSerializer(serializers.ModelSerializer):
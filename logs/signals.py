@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from logs.models import APIRequestLog
+from logs.usage_window import usage_window
+
+# =========================================================
+# Usage window maintenance
+# =========================================================
+@receiver(post_save, sender=APIRequestLog)
+def count_request_log(sender, instance, created, update_fields=None, **kwargs):
+    """New rows, soft deletes and restores move the cached day bucket of the row."""
+    day = timezone.localdate(instance.request_time)
+    if created:
+        if not instance.is_deleted:
+            usage_window.incr(instance.user_id, instance.endpoint_id, day)
+    elif update_fields and "is_deleted" in update_fields:
+        usage_window.incr(instance.user_id, instance.endpoint_id, day, -1 if instance.is_deleted else 1)
+
+
+@receiver(post_delete, sender=APIRequestLog)
+def uncount_request_log(sender, instance, **kwargs):
+    if not instance.is_deleted:
+        usage_window.incr(instance.user_id, instance.endpoint_id, timezone.localdate(instance.request_time), -1)
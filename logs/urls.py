@@ -12,6 +12,7 @@ urlpatterns = [
     # ADMIN API LOGS
     # ----------------------------
     path("admin/", views.AdminAPIRequestLogListView.as_view(), name="admin-api-log-list"),
+    path("admin/export/", views.AdminAPIRequestLogExportView.as_view(), name="admin-api-log-export"),
     path("admin/<uuid:pk>/", views.AdminAPIRequestLogDetailView.as_view(), name="admin-api-log-detail"),
     path("admin/<uuid:pk>/delete/", views.AdminAPIRequestLogDeleteView.as_view(), name="admin-api-log-delete"),
 ]
@@ -0,0 +1,91 @@
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+KEY_PREFIX = "logs:usage"
+
+# =========================================================
+# UsageWindow – per-day request counts kept in the cache
+# =========================================================
+class UsageWindow:
+    """
+    Sliding-window request counts per (user, endpoint) made of one cache
+    bucket per local day.
+
+    Past days are immutable once over, so their buckets live for
+    ``bucket_ttl``. Today's bucket is bumped by APIRequestLog signals and
+    kept for ``live_ttl`` only, so any increment lost in a race is corrected
+    by the next rebuild. Missing buckets are rebuilt from the log table with
+    one grouped query; a warm window costs a single ``get_many``.
+    """
+
+    def __init__(self, bucket_ttl=35 * 86400, live_ttl=3600):
+        self.bucket_ttl = bucket_ttl
+        self.live_ttl = live_ttl
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            bucket_ttl=getattr(settings, "USAGE_WINDOW_BUCKET_TTL_SECONDS", 35 * 86400),
+            live_ttl=getattr(settings, "USAGE_WINDOW_LIVE_TTL_SECONDS", 3600),
+        )
+
+    @staticmethod
+    def key(user_id, endpoint_id, day):
+        return f"{KEY_PREFIX}:{user_id}:{endpoint_id}:{day.isoformat()}"
+
+    def count(self, user_id, endpoint_id, days=30):
+        """Requests over the last ``days`` local days, today included."""
+        today = timezone.localdate()
+        window = [today - timedelta(days=offset) for offset in range(days)]
+        keys = {self.key(user_id, endpoint_id, day): day for day in window}
+
+        buckets = cache.get_many(list(keys))
+        missing = [day for key, day in keys.items() if key not in buckets]
+        total = sum(buckets.values())
+        if missing:
+            total += sum(self.rebuild(user_id, endpoint_id, missing).values())
+        return total
+
+    def rebuild(self, user_id, endpoint_id, days):
+        """Recount ``days`` from the log table and cache them. Returns {day: count}."""
+        from logs.models import APIRequestLog
+
+        tz = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(min(days), time.min), tz)
+        end = timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min), tz)
+        counted = dict(
+            APIRequestLog.objects
+            .filter(user_id=user_id, endpoint_id=endpoint_id, request_time__gte=start, request_time__lt=end)
+            .annotate(day=TruncDate("request_time"))
+            .values_list("day")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        counts = {day: counted.get(day, 0) for day in days}
+
+        today = timezone.localdate()
+        past = {self.key(user_id, endpoint_id, day): n for day, n in counts.items() if day != today}
+        if past:
+            cache.set_many(past, self.bucket_ttl)
+        if today in counts:
+            # add() keeps a bucket a concurrent rebuild already published
+            cache.add(self.key(user_id, endpoint_id, today), counts[today], self.live_ttl)
+        return counts
+
+    def incr(self, user_id, endpoint_id, day, delta=1):
+        """
+        Apply a live change to an already cached bucket. Uncached buckets are
+        left alone: the next read rebuilds them from the table, which already
+        includes this row.
+        """
+        try:
+            cache.incr(self.key(user_id, endpoint_id, day), delta)
+        except ValueError:
+            pass
+
+
+usage_window = UsageWindow.from_settings()
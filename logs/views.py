@@ -2,10 +2,12 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.utils import timezone
 from logs.models import APIRequestLog
-from apis.models import API
+from management.models import UsageHourlyRollup
 from logs.serializers import APIRequestLogSerializer
+from core.exports import stream_export
+from core.pagination import KeysetPagination
 from core.utils import api_success, api_error
-from django.db.models import Count
+from django.db.models import Sum
 from accounts.permissions import IsAdminUser, IsAuthenticatedUser
 
 # ==========================================
@@ -19,6 +21,8 @@ class UserAPIRequestLogListView(generics.ListAPIView):
     search_fields = ["user_name", "api_name", "status_code"]
     ordering_fields = ["request_time", "status_code"]
     ordering = ["-request_time"]
+    pagination_class = KeysetPagination
+    keyset_field = "request_time"
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -33,25 +37,40 @@ class UserAPIRequestLogListView(generics.ListAPIView):
 # USER API USAGE COUNT
 # ==========================================
 class UserAPIUsageCountView(generics.GenericAPIView):
+    """
+    Per-endpoint request counts for the current user, read from the hourly
+    usage rollups (see the rollup_usage command) instead of raw log rows.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        usage_data = (
-            APIRequestLog.objects
-            .filter(user=request.user, is_deleted=False)
+        rollups = (
+            UsageHourlyRollup.objects
+            .filter(user=request.user)
             .values(
-                "api__id",
-                "api__name",
-                "api__category__name",
-                "api__method",
-                "api__is_premium",
+                "endpoint__id",
+                "endpoint__name",
+                "endpoint__category__name",
+                "endpoint__method",
+                "endpoint__is_premium",
             )
-            .annotate(request_count=Count("id"))
+            .annotate(request_count=Sum("request_count"))
             .order_by("-request_count")
         )
+        usage_data = [
+            {
+                "api__id": row["endpoint__id"],
+                "api__name": row["endpoint__name"],
+                "api__category__name": row["endpoint__category__name"],
+                "api__method": row["endpoint__method"],
+                "api__is_premium": row["endpoint__is_premium"],
+                "request_count": row["request_count"],
+            }
+            for row in rollups
+        ]
 
         return api_success(
-            data=list(usage_data),
+            data=usage_data,
             message="User API usage count fetched successfully",
             status_code=status.HTTP_200_OK,
         )
@@ -66,6 +85,8 @@ class AdminAPIRequestLogListView(generics.ListAPIView):
     search_fields = ["user_name", "api_name", "status_code"]
     ordering_fields = ["request_time", "status_code"]
     ordering = ["-request_time"]
+    pagination_class = KeysetPagination
+    keyset_field = "request_time"
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -76,6 +97,43 @@ class AdminAPIRequestLogListView(generics.ListAPIView):
         serializer = self.get_serializer(queryset, many=True)
         return api_success(data=serializer.data, message="Admin API logs fetched successfully")
 
+# ==========================================
+# ADMIN API LOG EXPORT
+# ==========================================
+class AdminAPIRequestLogExportView(generics.ListAPIView):
+    """Streams every matching log row as ?file_format=csv (default) or ndjson."""
+    queryset = APIRequestLog.objects.all()
+    permission_classes = [IsAdminUser]
+    search_fields = ["user_name", "api_name", "status_code"]
+    ordering_fields = ["request_time", "status_code"]
+    ordering = ["-request_time"]
+    export_columns = [
+        ("id", "id"),
+        ("user_id", "user_id"),
+        ("user_name", "user__username"),
+        ("api_id", "endpoint_id"),
+        ("api_name", "endpoint__name"),
+        ("api_method", "endpoint__method"),
+        ("request_time", "request_time"),
+        ("status_code", "status_code"),
+        ("path_params", "path_params"),
+        ("query_params", "query_params"),
+        ("response", "response"),
+        ("created_at", "created_at"),
+    ]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            return stream_export(
+                queryset,
+                self.export_columns,
+                export_format=request.query_params.get("file_format", "csv"),
+                filename="api-request-logs",
+            )
+        except ValueError as e:
+            return api_error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
 # ==========================================
 # ADMIN API LOG DETAIL
 # ==========================================
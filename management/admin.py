@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     Category, Endpoint, Example, ResponseModel,
-    Subscription, Usage, Media
+    Subscription, Usage, Media,
+    UsageHourlyRollup, UsageDailyRollup
 )
 
 # =========================================================
@@ -111,3 +112,22 @@ class MediaAdmin(admin.ModelAdmin):
     list_display = ('api', 'file', 'description', 'created_at')
     search_fields = ('api__name', 'description')
     list_filter = ('created_at',)
+
+
+# =========================================================
+# Usage Rollup Admin (maintained by the rollup_usage command)
+# =========================================================
+@admin.register(UsageHourlyRollup)
+class UsageHourlyRollupAdmin(admin.ModelAdmin):
+    list_display = ('endpoint', 'user', 'status_class', 'hour', 'request_count')
+    search_fields = ('endpoint__name', 'user__username')
+    list_filter = ('status_class', 'hour')
+    readonly_fields = ('endpoint', 'user', 'status_class', 'hour', 'request_count', 'latency_buckets')
+
+
+@admin.register(UsageDailyRollup)
+class UsageDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('endpoint', 'day', 'request_count')
+    search_fields = ('endpoint__name',)
+    list_filter = ('day',)
+    readonly_fields = ('endpoint', 'day', 'request_count', 'latency_buckets')
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.db.models import Avg, Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from core.sketches import LatencySketch
+from management.models import Endpoint, Usage
+
+QUANTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+# =========================================================
+# Time windows
+# =========================================================
+def parse_window(params, default_hours=24):
+    """
+    ``(since, until)`` from ``?since=&until=`` (ISO 8601) or ``?hours=``.
+    Raises ValueError with a message fit for the API client on malformed input.
+    """
+    until = _parse_datetime(params, "until") or timezone.now()
+    since = _parse_datetime(params, "since")
+    if since is None:
+        try:
+            hours = float(params.get("hours", default_hours))
+            if not 0 < hours < float("inf"):
+                raise ValueError
+            since = until - timedelta(hours=hours)
+        except (ValueError, OverflowError):
+            raise ValueError("hours must be a positive number") from None
+    if since >= until:
+        raise ValueError("since must be earlier than until")
+    return since, until
+
+
+def _parse_datetime(params, name):
+    if not params.get(name):
+        return None
+    try:
+        value = parse_datetime(params[name])
+    except ValueError:
+        # Well-formed but impossible, e.g. month 13
+        value = None
+    if value is None:
+        raise ValueError(f"{name} must be an ISO 8601 datetime")
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+# =========================================================
+# Latency percentiles per endpoint
+# =========================================================
+def latency_percentiles(since, until):
+    """
+    p50/p95/p99 request latency per endpoint over ``[since, until)``.
+
+    The database groups Usage rows by stored sketch bucket, so only one row per
+    (endpoint, bucket) is loaded no matter how many requests were made.
+    """
+    window = Usage.objects.filter(
+        request_time__gte=since, request_time__lt=until, latency_bucket__isnull=False
+    )
+    sketches = defaultdict(LatencySketch)
+    for endpoint_id, bucket, count in (
+        window.values_list("subscription__api_id", "latency_bucket")
+        .annotate(n=Count("id"))
+        .order_by()
+    ):
+        sketches[endpoint_id].add_bucket(bucket, count)
+
+    db_time = dict(
+        window.values_list("subscription__api_id")
+        .annotate(avg_db=Avg("db_duration_ms"))
+        .order_by()
+    )
+    endpoints = {
+        row["id"]: row
+        for row in Endpoint.all_objects.filter(id__in=sketches).values("id", "name", "slug", "method")
+    }
+
+    results = []
+    for endpoint_id, sketch in sketches.items():
+        endpoint = endpoints.get(endpoint_id, {})
+        avg_db = db_time.get(endpoint_id)
+        results.append({
+            "endpoint_id": endpoint_id,
+            "name": endpoint.get("name"),
+            "slug": endpoint.get("slug"),
+            "method": endpoint.get("method"),
+            "count": sketch.count,
+            **{name: sketch.quantile(q) for name, q in QUANTILES.items()},
+            "avg_db_ms": round(avg_db, 2) if avg_db is not None else None,
+        })
+    results.sort(key=lambda row: row["p95"] or 0, reverse=True)
+    return results
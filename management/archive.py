@@ -0,0 +1,226 @@
+import gzip
+import json
+import os
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from management.models import RollupWatermark
+from management.rollups import WATERMARK_NAME
+
+# Archivable append-only tables, by source name
+ARCHIVE_SOURCES = {
+    "usage": "management.Usage",
+    "request_logs": "logs.APIRequestLog",
+}
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ArchiveError(Exception):
+    pass
+
+# =========================================================
+# UsageArchive – date-partitioned NDJSON.gz cold storage
+# =========================================================
+class UsageArchive:
+    """
+    Moves old rows of an append-only table out of the database into
+    ``<root>/<source>/YYYY/MM/DD/part-<first id>.ndjson.gz`` files (one part
+    per batch and ``created_at`` day) and brings date ranges back on demand.
+
+    ``manifest.json`` next to the partitions lists every day with its part
+    files, row counts and created_at range. Parts are written (and the
+    manifest saved) before rows are deleted, so a crash can only leave rows
+    both in the archive and the table. A part is named after the first row
+    of its batch, so a retried batch atomically replaces its earlier copy
+    instead of rewriting the day; rows archived twice under different parts
+    are deduplicated by id on restore, which skips ids that already exist.
+
+    Restored days are marked in the manifest and left in the table by later
+    runs until they are archived again explicitly (``include_restored``).
+    """
+
+    def __init__(self, source, root=None):
+        if source not in ARCHIVE_SOURCES:
+            raise ArchiveError(f"Unknown archive source '{source}'")
+        label = ARCHIVE_SOURCES[source]
+        if not apps.is_installed(label.split(".")[0]):
+            raise ArchiveError(f"App for {label} is not installed")
+        self.source = source
+        self.model = apps.get_model(label)
+        self.root = Path(root or settings.USAGE_ARCHIVE_ROOT) / source
+        self.fields = self.model._meta.concrete_fields
+
+    # ---------------------------------
+    # Manifest
+    # ---------------------------------
+    @property
+    def manifest_path(self):
+        return self.root / MANIFEST_NAME
+
+    def load_manifest(self):
+        if not self.manifest_path.exists():
+            return {"source": self.source, "model": self.model._meta.label, "partitions": {}}
+        with open(self.manifest_path) as fh:
+            return json.load(fh)
+
+    def save_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def part_file(day, name):
+        return f"{day:%Y}/{day:%m}/{day:%d}/{name}.ndjson.gz"
+
+
+    # ---------------------------------
+    # Archiving
+    # ---------------------------------
+    def cutoff(self, older_than_days):
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        if self.source == "usage":
+            # Never archive rows the rollups have not consumed yet
+            watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list("position", flat=True).first()
+            cutoff = min(cutoff, watermark) if watermark else None
+        return cutoff
+
+    def archive(self, older_than_days, batch_size=5000, include_restored=False):
+        """Move rows created before the cutoff to the archive. Returns rows moved."""
+        cutoff = self.cutoff(older_than_days)
+        if cutoff is None:
+            return 0
+
+        queryset = self.model.all_objects.filter(created_at__lt=cutoff)
+        if not include_restored:
+            for day in self.restored_days():
+                start = timezone.make_aware(datetime.combine(day, time.min))
+                queryset = queryset.exclude(Q(created_at__gte=start, created_at__lt=start + timedelta(days=1)))
+
+        attnames = [field.attname for field in self.fields]
+        moved = 0
+        while True:
+            rows = list(queryset.order_by("created_at", "pk").values(*attnames)[:batch_size])
+            if not rows:
+                break
+            self.write_partitions(rows)
+            with transaction.atomic():
+                self.model.all_objects.filter(pk__in=[row["id"] for row in rows]).delete()
+            moved += len(rows)
+        return moved
+
+    def restored_days(self):
+        return [
+            date.fromisoformat(day)
+            for day, partition in self.load_manifest()["partitions"].items()
+            if partition.get("restored_at")
+        ]
+
+    def write_partitions(self, rows):
+        """Write one part per day of ``rows`` (a batch ordered by created_at, pk)."""
+        by_day = defaultdict(list)
+        for row in rows:
+            by_day[timezone.localdate(row["created_at"])].append(row)
+
+        manifest = self.load_manifest()
+        for day, day_rows in sorted(by_day.items()):
+            name = f"part-{day_rows[0]['id']}"
+            relative = self.part_file(day, name)
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, (json.dumps(row, default=_encode, separators=(",", ":")) for row in day_rows))
+
+            partition = manifest["partitions"].setdefault(day.isoformat(), {})
+            partition.setdefault("parts", {})[name] = {
+                "file": relative,
+                "rows": len(day_rows),
+                "min_created_at": day_rows[0]["created_at"].isoformat(),
+                "max_created_at": day_rows[-1]["created_at"].isoformat(),
+            }
+            parts = partition["parts"].values()
+            # Lines written: a row archived again under another part counts twice
+            partition["rows"] = sum(part["rows"] for part in parts)
+            partition["min_created_at"] = min(part["min_created_at"] for part in parts)
+            partition["max_created_at"] = max(part["max_created_at"] for part in parts)
+            partition["updated_at"] = timezone.now().isoformat()
+            partition.pop("restored_at", None)
+        self.save_manifest(manifest)
+
+    @staticmethod
+    def _write_atomic(path, lines):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as fh:
+                for line in lines:
+                    fh.write(line.encode("utf-8"))
+                    fh.write(b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+
+    # ---------------------------------
+    # Restoring
+    # ---------------------------------
+    def restore(self, since, until, batch_size=5000):
+        """Load archived rows for days in ``[since, until]`` back into the table."""
+        manifest = self.load_manifest()
+        restored = 0
+        for day, partition in sorted(manifest["partitions"].items()):
+            if not since.isoformat() <= day <= until.isoformat():
+                continue
+            batch = []
+            for _, part in sorted(partition["parts"].items()):
+                for obj in self.read_partition(self.root / part["file"]):
+                    batch.append(obj)
+                    if len(batch) >= batch_size:
+                        restored += self.insert_missing(batch)
+                        batch = []
+            restored += self.insert_missing(batch)
+            partition["restored_at"] = timezone.now().isoformat()
+        self.save_manifest(manifest)
+        return restored
+
+    def read_partition(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                yield self.model(**{
+                    field.attname: field.to_python(data.get(field.attname)) for field in self.fields
+                })
+
+    def insert_missing(self, objs):
+        if not objs:
+            return 0
+        # Partitions written by older versions may hold the same row twice
+        unique = list({obj.pk: obj for obj in objs}.values())
+        existing = set(
+            self.model.all_objects.filter(pk__in=[obj.pk for obj in unique]).values_list("pk", flat=True)
+        )
+        missing = [obj for obj in unique if obj.pk not in existing]
+        # Raw insert (like loaddata) keeps archived auto_now/auto_now_add values
+        with transaction.atomic():
+            for start in range(0, len(missing), 500):
+                self.model.all_objects._insert(missing[start:start + 500], fields=self.fields, raw=True)
+        return len(missing)
+
+
+def _encode(value):
+    """JSON fallback that keeps full datetime precision (unlike DjangoJSONEncoder)."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
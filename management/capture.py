@@ -0,0 +1,101 @@
+import json
+import random
+from django.conf import settings
+
+DEFAULT_CAPTURE_POLICY = {
+    "enabled": True,
+    "content_types": ["application/json"],
+    "max_bytes": 8192,
+    "sample_rate": 100,
+}
+
+# =========================================================
+# BodyCapturePolicy – what part of a request body Usage keeps
+# =========================================================
+class BodyCapturePolicy:
+    """
+    Decides whether and how much of a request body is stored on a Usage record.
+
+    Settings come from ``USAGE_BODY_CAPTURE``: a ``default`` policy plus
+    per-endpoint overrides keyed by Endpoint slug or id. Only JSON content
+    types are captured, bodies are read in chunks up to ``max_bytes`` (larger
+    bodies are never loaded, only their size is recorded) and ``sample_rate``
+    is the percentage of requests whose body is kept at all.
+    """
+
+    chunk_size = 4096
+
+    def __init__(self, default=None, endpoints=None):
+        self.default = {**DEFAULT_CAPTURE_POLICY, **(default or {})}
+        self.endpoints = {
+            str(key): {**self.default, **override}
+            for key, override in (endpoints or {}).items()
+        }
+
+    @classmethod
+    def from_settings(cls):
+        config = getattr(settings, "USAGE_BODY_CAPTURE", {})
+        return cls(default=config.get("default"), endpoints=config.get("endpoints"))
+
+    def for_endpoint(self, endpoint_id=None, slug=None):
+        return self.endpoints.get(str(endpoint_id)) or self.endpoints.get(slug) or self.default
+
+    def capture(self, request, endpoint_id=None, slug=None):
+        """Return the JSON value to store as ``Usage.request_body``."""
+        policy = self.for_endpoint(endpoint_id, slug)
+        if not policy["enabled"]:
+            return {}
+        if policy["sample_rate"] < 100 and random.random() * 100 >= policy["sample_rate"]:
+            return {}
+        if not self.is_capturable_type(request.content_type, policy["content_types"]):
+            return {}
+
+        max_bytes = policy["max_bytes"]
+        try:
+            declared = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_bytes:
+            return {"_truncated": True, "_size": declared}
+
+        raw = self.read_bounded(request, max_bytes)
+        if raw is None:
+            return {"_truncated": True, "_size": declared or None}
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except Exception:
+            return {}
+
+    @staticmethod
+    def is_capturable_type(content_type, allowed):
+        content_type = (content_type or "").lower()
+        return content_type in allowed or content_type.endswith("+json")
+
+    def read_bounded(self, request, max_bytes):
+        """
+        Body bytes if they fit in ``max_bytes``, otherwise None. Reuses the
+        body already loaded by the view; otherwise reads the stream in chunks
+        and stops as soon as the cap is exceeded.
+        """
+        body = getattr(request, "_body", None)
+        if body is not None:
+            return body if len(body) <= max_bytes else None
+        if getattr(request, "_read_started", False):
+            return b""
+
+        chunks = []
+        size = 0
+        while True:
+            chunk = request.read(self.chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                return None
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+capture_policy = BodyCapturePolicy.from_settings()
@@ -0,0 +1,23 @@
+from django.conf import settings
+from core.response_cache import TableFingerprint, VersionedResponseCache
+from management.models import Category, Endpoint, Example, Media, ResponseModel
+
+# =========================================================
+# Public catalog response cache
+# =========================================================
+# Version of the catalog tables, read from the database so every worker
+# agrees on it whatever the cache backend (also keys the catalog snapshot)
+catalog_fingerprint = TableFingerprint(
+    (Category, Endpoint, Example, ResponseModel, Media),
+    max_age=getattr(settings, "CATALOG_VERSION_MAX_AGE_SECONDS", 5),
+)
+
+# Rendered list/retrieve responses of the catalog viewsets (endpoints,
+# examples, responses, media). Catalog model signals drop the local memo of
+# the fingerprint; other workers pick changes up within its max age.
+catalog_cache = VersionedResponseCache(
+    namespace="catalog",
+    alias=getattr(settings, "CATALOG_CACHE_ALIAS", "default"),
+    timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 300),
+    fingerprint=catalog_fingerprint,
+)
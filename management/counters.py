@@ -0,0 +1,73 @@
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db.models import F
+from core.workers import PeriodicFlusher
+from management.models import Subscription
+
+# =========================================================
+# UsageCounter – coalesced Subscription.usage_count deltas
+# =========================================================
+class UsageCounter:
+    """
+    Accumulates usage_count increments per (user_id, endpoint_id) in memory
+    and periodically applies each pending delta as a single
+    ``UPDATE ... SET usage_count = usage_count + delta`` using ``F()``.
+
+    The UPDATE is atomic in the database, so concurrent threads and worker
+    processes never lose increments. Deltas that fail to apply are merged
+    back and retried on the next flush.
+    """
+
+    def __init__(self, flush_interval_ms=1000):
+        self.flush_interval_ms = flush_interval_ms
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._deltas = Counter()
+        self.flusher = PeriodicFlusher(
+            self.flush,
+            interval=flush_interval_ms / 1000,
+            name="UsageCounter",
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(flush_interval_ms=getattr(settings, "USAGE_COUNTER_FLUSH_INTERVAL_MS", 1000))
+
+    def incr(self, user_id, endpoint_id, amount=1):
+        """Record ``amount`` uses of ``endpoint_id`` by ``user_id``."""
+        self.flusher.start()
+        with self._lock:
+            self._deltas[(user_id, endpoint_id)] += amount
+
+    def pending(self):
+        """Total increments not yet written to the database."""
+        with self._lock:
+            return sum(self._deltas.values())
+
+    def flush(self):
+        """Apply all pending deltas. Returns the number of increments written."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, Counter()
+
+            applied = 0
+            failed = Counter()
+            for (user_id, endpoint_id), delta in deltas.items():
+                try:
+                    Subscription.all_objects.filter(user_id=user_id, api_id=endpoint_id).update(
+                        usage_count=F("usage_count") + delta
+                    )
+                except Exception as e:
+                    failed[(user_id, endpoint_id)] = delta
+                    print(f"[UsageCounter] Failed to apply usage_count delta: {e}")
+                    continue
+                applied += delta
+
+            if failed:
+                with self._lock:
+                    self._deltas.update(failed)
+        return applied
+
+
+usage_counter = UsageCounter.from_settings()
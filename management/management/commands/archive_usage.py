@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from management.archive import ARCHIVE_SOURCES, ArchiveError, UsageArchive
+
+
+class Command(BaseCommand):
+    help = "Move usage/request-log rows older than the retention window into compressed daily archive files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", choices=sorted(ARCHIVE_SOURCES), default="usage")
+        parser.add_argument("--older-than-days", type=int, default=None, help="Defaults to USAGE_RETENTION_DAYS")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--include-restored", action="store_true", help="Also archive days brought back with restore_usage"
+        )
+
+    def handle(self, *args, **options):
+        days = options["older_than_days"]
+        if days is None:
+            days = settings.USAGE_RETENTION_DAYS
+        try:
+            archive = UsageArchive(options["source"])
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        moved = archive.archive(
+            older_than_days=days, batch_size=options["batch_size"], include_restored=options["include_restored"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} {options['source']} rows to {archive.root}"))
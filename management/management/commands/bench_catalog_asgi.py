@@ -0,0 +1,144 @@
+import asyncio
+import time
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+from management.counters import usage_counter
+from management.middleware import APILoggingMiddleware
+from management.models import Category, Endpoint, Example, ResponseModel
+from management.quotas import quota_enforcer
+from management.usage_buffer import usage_buffer
+
+CATALOG_PATHS = [
+    "/api/management/endpoints/",
+    "/api/management/examples/",
+    "/api/management/responses/",
+    "/api/management/media/",
+]
+
+LOGGING_MIDDLEWARE = "management.middleware.APILoggingMiddleware"
+SYNC_ONLY_MIDDLEWARE = f"{__name__}.SyncOnlyAPILoggingMiddleware"
+
+
+class SyncOnlyAPILoggingMiddleware(APILoggingMiddleware):
+    """The pre-ASGI behaviour: Django wraps the middleware in a thread hop."""
+    async_capable = False
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the catalog list endpoints through the ASGI handler (what uvicorn calls) "
+        "and compare requests/sec with the sync-only and the async logging middleware. "
+        "Every request must return 200; the benchmark user's quota is lifted for the run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=20, help="Endpoints (with examples and responses) to create")
+
+    def handle(self, *args, **options):
+        created = self.seed_catalog(options["seed"])
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f"bench-{tag}", email=f"bench-{tag}@example.com")
+        token = str(RefreshToken.for_user(user).access_token)
+        # Keep the quota check in the path, with limits the run cannot reach
+        default_limits = quota_enforcer.default_limits
+        quota_enforcer.default_limits = dict(default_limits, requests_per_minute=10**9, requests_per_day=10**9)
+        quota_enforcer.clear()
+
+        try:
+            for label, middleware in (("before (sync-only)", SYNC_ONLY_MIDDLEWARE), ("after (async)", LOGGING_MIDDLEWARE)):
+                stack = [middleware if m == LOGGING_MIDDLEWARE else m for m in settings.MIDDLEWARE]
+                with override_settings(MIDDLEWARE=stack):
+                    handler = ASGIHandler()
+                    rps = asyncio.run(self.run(handler, token, options["requests"], options["concurrency"]))
+                self.stdout.write(f"{label:<20} {rps:>10.1f} req/s")
+        finally:
+            quota_enforcer.default_limits = default_limits
+            quota_enforcer.clear()
+            usage_buffer.flush()
+            usage_counter.flush()
+            user.hard_delete()
+            for obj in reversed(created):
+                obj.hard_delete()
+
+    def seed_catalog(self, count):
+        category = Category.objects.create(name=f"bench-{uuid.uuid4().hex[:8]}")
+        created = [category]
+        for i in range(count):
+            endpoint = Endpoint.objects.create(
+                category=category, name=f"Bench {i}", method="GET",
+                url=f"http://localhost/api/management/endpoints/bench-{i}/",
+            )
+            created.append(endpoint)
+            created.append(Example.objects.create(
+                api=endpoint, language="python", request_type="requests", code_snippet="requests.get(url)"
+            ))
+            created.append(ResponseModel.objects.create(api=endpoint, body={"ok": True}))
+        # One Endpoint per benchmarked path, so every request goes through logging
+        for path in CATALOG_PATHS:
+            created.append(Endpoint.objects.create(
+                category=category, name=f"Bench {path}", method="GET", url=f"http://localhost{path}"
+            ))
+        return created
+
+    async def run(self, handler, token, total, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                path = CATALOG_PATHS[i % len(CATALOG_PATHS)]
+                return path, await self.request(handler, path, token)
+
+        # Warm up indexes and caches before timing
+        await asyncio.gather(*(one(i) for i in range(len(CATALOG_PATHS))))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+        failures = Counter(result for result in results if result[1] != 200)
+        if failures:
+            details = ", ".join(f"{path} -> {code} x{n}" for (path, code), n in failures.items())
+            raise CommandError(f"{sum(failures.values())} of {total} requests did not return 200: {details}")
+        return total / elapsed
+
+    @staticmethod
+    async def request(handler, path, token):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"authorization", f"Bearer {token}".encode()),
+            ],
+            "client": ("127.0.0.1", 12345),
+            "server": ("localhost", 80),
+        }
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.sleep(3600)
+            return {"type": "http.disconnect"}
+
+        status = {}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        await handler(scope, receive, send)
+        return status.get("code")
@@ -0,0 +1,58 @@
+from django.core.management.base import CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from core.renderers import FastJSONRenderer, orjson
+from management.management.commands.bench_serializers import Command as SerializerBenchmark, _Rollback
+from management.models import Category
+from management.serializers import CategorySerializer, SnapshotEndpointSerializer, UsageSerializer
+from management.snapshot import catalog_snapshot
+from management.views import UsageViewSet
+
+
+class Command(SerializerBenchmark):
+    help = (
+        "Compare MB/s of DRF's JSONRenderer and FastJSONRenderer on large usage and catalog "
+        "envelopes (generated data, rolled back), and check the bytes are identical."
+    )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; FastJSONRenderer uses the stdlib path"))
+        try:
+            with transaction.atomic():
+                results = self.measure(options["rows"], options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        for label, size, drf_rate, fast_rate in results:
+            self.stdout.write(
+                f"{label:<8} {size / 1e6:>7.2f} MB   drf {drf_rate:>8.1f} MB/s   "
+                f"fast {fast_rate:>8.1f} MB/s   x{fast_rate / drf_rate:.1f}"
+            )
+
+    def measure(self, rows, repeat):
+        self.seed(rows)
+        usages = UsageSerializer(list(UsageViewSet.queryset.all()), many=True).data
+        catalog = {
+            "categories": CategorySerializer(Category.objects.all(), many=True).data,
+            "endpoints": SnapshotEndpointSerializer(catalog_snapshot.endpoint_queryset(), many=True).data,
+        }
+        cases = [
+            ("usages", {"success": True, "message": f"{len(usages)} API usage records found", "data": usages}),
+            ("catalog", {"success": True, "message": "Catalog", "data": catalog}),
+        ]
+
+        drf, fast = JSONRenderer(), FastJSONRenderer()
+        results = []
+        for label, envelope in cases:
+            expected = drf.render(envelope)
+            if fast.render(envelope) != expected:
+                raise CommandError(f"{label}: FastJSONRenderer output differs from JSONRenderer")
+            size = len(expected)
+            results.append((
+                label, size,
+                size / 1e6 / self.best(lambda: drf.render(envelope), repeat),
+                size / 1e6 / self.best(lambda: fast.render(envelope), repeat),
+            ))
+        return results
@@ -0,0 +1,92 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from accounts.models import User
+from management.models import Category, Endpoint, Example, Subscription, Usage
+from management.views import EndpointViewSet, ExampleViewSet, UsageViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of the DRF serializers and the compiled values() plans behind the "
+        "endpoint, example and usage lists (generated data, rolled back), and check the output is identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000, help="Rows per resource")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path (best is reported)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                results = self.measure(options["rows"], options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        for label, drf_rate, fast_rate in results:
+            self.stdout.write(
+                f"{label:<10} drf {drf_rate:>10.0f} rows/s   fast {fast_rate:>10.0f} rows/s   x{fast_rate / drf_rate:.1f}"
+            )
+
+    def measure(self, rows, repeat):
+        self.seed(rows)
+        cases = [
+            ("endpoints", EndpointViewSet, Endpoint.objects.select_related("category")),
+            ("examples", ExampleViewSet, Example.objects.select_related("api__category")),
+            ("usages", UsageViewSet, UsageViewSet.queryset),
+        ]
+        renderer = JSONRenderer()
+        results = []
+        for label, viewset, queryset in cases:
+            fast = viewset.fast_serializer
+            plan = fast.default_plan
+            if plan is None:
+                raise CommandError(f"{fast.serializer_class.__name__} has no compiled plan")
+
+            def drf():
+                return fast.serializer_class(list(queryset.all()), many=True).data
+
+            def compiled():
+                return plan.render(list(plan.rows(queryset.all())))
+
+            if renderer.render(drf()) != renderer.render(compiled()):
+                raise CommandError(f"{label}: compiled output differs from {fast.serializer_class.__name__}")
+            results.append((label, rows / self.best(drf, repeat), rows / self.best(compiled, repeat)))
+        return results
+
+    def best(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def seed(self, rows):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f"bench-{tag}", email=f"bench-{tag}@example.com")
+        category = Category.objects.create(name=f"bench-{tag}", description="<p>Benchmark category</p>")
+        endpoints = Endpoint.objects.bulk_create([
+            Endpoint(
+                category=category, name=f"Bench {i}", slug=f"bench-{tag}-{i}", method="GET",
+                url=f"https://example.com/bench/{i}", description="<p>Benchmark endpoint</p>" * 10,
+                path_params=[{"name": "id", "type": "int"}], query_params=[{"name": "q"}],
+            )
+            for i in range(rows)
+        ])
+        Example.objects.bulk_create([
+            Example(api=endpoint, language="python", request_type="requests", code_snippet="requests.get(url)")
+            for endpoint in endpoints
+        ])
+        subscription = Subscription.objects.create(user=user, api=endpoints[0])
+        Usage.objects.bulk_create([
+            Usage(subscription=subscription, status_code=200, request_body={"page": i}, query_params={"q": "x"})
+            for i in range(rows)
+        ])
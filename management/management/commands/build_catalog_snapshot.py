@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from management.snapshot import catalog_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the pre-compressed catalog snapshot at the best compression levels, "
+        "re-rendering only stale endpoint fragments. Run it off the request path (deploys, cron)."
+    )
+
+    def handle(self, *args, **options):
+        artifact = catalog_snapshot.build()
+        self.stdout.write(
+            f"Snapshot {artifact['etag']}: {artifact['endpoints']} endpoints, {artifact['rebuilt']} re-rendered"
+        )
+        for coding, content in artifact["content"].items():
+            self.stdout.write(f"  {coding}: {len(content)} bytes")
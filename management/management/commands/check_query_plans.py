@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from management.query_plans import FULL_SCAN_PATTERNS, full_scans, hot_querysets, sorts
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the hot querysets (catalog lists, usage windows, rollups, request logs) "
+        "against the configured database and fail if any of them falls back to a full table scan. "
+        "The same checks run in management.tests on the test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every query plan")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Query plan checks are not supported on {connection.vendor}")
+
+        failures = []
+        for label, queryset in hot_querysets():
+            scanned, plan = full_scans(queryset)
+            if options["verbose_plans"]:
+                self.stdout.write(f"--- {label}\n{plan}")
+
+            if scanned:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {label}: {', '.join(scanned)}"))
+            elif sorts(plan):
+                self.stdout.write(self.style.WARNING(f"SORT       {label}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK         {label}"))
+
+        if failures:
+            raise CommandError(f"{len(failures)} queryset(s) fall back to a full scan: {', '.join(failures)}")
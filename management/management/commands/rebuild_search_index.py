@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from management.search import search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SQLite FTS5 catalog search index from the active categories, endpoints and examples."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(f"Full-text search index is SQLite only ({connection.vendor} uses LIKE search)")
+        counts = search_index.rebuild()
+        if not counts:
+            raise CommandError("This SQLite build has no FTS5 support")
+        for kind, rows in counts.items():
+            self.stdout.write(f"Indexed {rows} {kind} rows")
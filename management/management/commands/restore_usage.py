@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from management.archive import ARCHIVE_SOURCES, ArchiveError, UsageArchive
+
+
+class Command(BaseCommand):
+    help = "Load archived usage/request-log rows for a date range back into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", choices=sorted(ARCHIVE_SOURCES), default="usage")
+        parser.add_argument("--since", required=True, help="First day to restore (YYYY-MM-DD)")
+        parser.add_argument("--until", required=True, help="Last day to restore (YYYY-MM-DD), inclusive")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        since, until = parse_date(options["since"]), parse_date(options["until"])
+        if not since or not until or since > until:
+            raise CommandError("--since and --until must be YYYY-MM-DD dates with since <= until")
+        try:
+            archive = UsageArchive(options["source"])
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        restored = archive.restore(since, until, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} {options['source']} rows"))
@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from management.rollups import roll_up_usage
+
+
+class Command(BaseCommand):
+    help = "Fold new Usage rows into the hourly/daily rollup tables (incremental, watermark based)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag-seconds", type=int, default=60, help="Leave rows younger than this for the next run")
+        parser.add_argument("--window-hours", type=int, default=24, help="Rows per transaction, by creation time")
+        parser.add_argument("--loop", action="store_true", help="Keep running as a background job")
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between runs with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = roll_up_usage(lag_seconds=options["lag_seconds"], window_hours=options["window_hours"])
+            self.stdout.write(f"Rolled up {processed} usage rows")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
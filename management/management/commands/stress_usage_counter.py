@@ -0,0 +1,93 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from accounts.models import User
+from management.counters import UsageCounter
+from management.models import Category, Endpoint, Subscription
+
+
+def _hammer(user_id, endpoint_id, threads, increments, flush_interval_ms):
+    """Increment from ``threads`` threads while the background flusher runs, then drain."""
+    counter = UsageCounter(flush_interval_ms=flush_interval_ms)
+
+    def work():
+        for i in range(increments):
+            counter.incr(user_id, endpoint_id)
+            if i % 97 == 0:
+                counter.flush()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    counter.flusher.stop()
+    while counter.pending():
+        time.sleep(0.05)
+        counter.flush()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Stress the coalesced usage counters from many threads and processes and verify no increment is lost."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--increments", type=int, default=1000, help="Increments per thread")
+        parser.add_argument("--flush-interval-ms", type=int, default=20)
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        threads = options["threads"]
+        increments = options["increments"]
+        flush_interval_ms = options["flush_interval_ms"]
+
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f"stress-{tag}", email=f"stress-{tag}@example.com")
+        category = Category.objects.create(name=f"stress-{tag}")
+        endpoint = Endpoint.objects.create(
+            category=category, name=f"stress-{tag}", method="GET", url=f"http://localhost/stress/{tag}/"
+        )
+        subscription = Subscription.objects.create(user=user, api=endpoint)
+
+        try:
+            started = time.perf_counter()
+            # Children must open their own database connections
+            connections.close_all()
+            context = multiprocessing.get_context("fork")
+            children = [
+                context.Process(
+                    target=_hammer,
+                    args=(user.pk, endpoint.pk, threads, increments, flush_interval_ms),
+                )
+                for _ in range(processes)
+            ]
+            for child in children:
+                child.start()
+            for child in children:
+                child.join()
+            elapsed = time.perf_counter() - started
+
+            failed = [child.exitcode for child in children if child.exitcode != 0]
+            if failed:
+                raise CommandError(f"{len(failed)} worker process(es) exited with errors: {failed}")
+
+            expected = processes * threads * increments
+            subscription.refresh_from_db()
+            self.stdout.write(
+                f"{processes} processes x {threads} threads x {increments} increments "
+                f"in {elapsed:.2f}s: expected {expected}, stored {subscription.usage_count}"
+            )
+            if subscription.usage_count != expected:
+                raise CommandError(f"Lost {expected - subscription.usage_count} increments")
+            self.stdout.write(self.style.SUCCESS("No increments lost"))
+        finally:
+            subscription.hard_delete()
+            endpoint.hard_delete()
+            category.hard_delete()
+            user.hard_delete()
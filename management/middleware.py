@@ -1,67 +1,265 @@
-import json
-from django.utils.deprecation import MiddlewareMixin
-from django.urls import resolve
-from management.models import Subscription, Usage, Endpoint
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from core.ratelimit import rate_limit_headers
+from core.sketches import LatencySketch
+from core.timing import track_db_time
+from management.capture import capture_policy
+from management.counters import usage_counter
+from management.quotas import quota_enforcer
+from management.routing import endpoint_index
+from management.subscription_cache import subscription_cache
+from management.usage_buffer import UsageRecord, usage_buffer
 
-class APILoggingMiddleware(MiddlewareMixin):
+class APILoggingMiddleware:
     """
     Middleware to automatically create a subscription and log API usage
     for authenticated users accessing valid API endpoints.
+
+    Works natively under both WSGI and ASGI: in async mode the endpoint and
+    subscription lookups are served from in-memory indexes and records are
+    queued without blocking, so the event loop only hops to a thread when
+    the index must be rebuilt or a new subscription created.
     """
-    def process_response(self, request, response):
-        user = getattr(request, "user", None)
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with track_db_time() as db_timer:
+            response = self.get_response(request)
+        timing = (time.perf_counter() - started, db_timer.seconds)
+        try:
+            self.log_usage(request, response, timing)
+        except Exception as e:
+            # Fail silently; logging only
+            print(f"[APILoggingMiddleware] Failed to log API usage: {e}")
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with track_db_time() as db_timer:
+            response = await self.get_response(request)
+        timing = (time.perf_counter() - started, db_timer.seconds)
+        try:
+            await self.alog_usage(request, response, timing)
+        except Exception as e:
+            # Fail silently; logging only
+            print(f"[APILoggingMiddleware] Failed to log API usage: {e}")
+        return response
+
+    # ---------------------------------
+    # Sync path
+    # ---------------------------------
+    def log_usage(self, request, response, timing=None):
+        # Only log API endpoints
+        if not request.path.startswith("/api/"):
+            return
 
         # Only log for authenticated users
+        user = getattr(request, "user", None)
         if not user or not user.is_authenticated:
-            return response
+            return
 
-        # Only log API endpoints
+        # Map the request to an Endpoint through the in-memory index
+        endpoint_id = endpoint_index.resolve(request.path, slug=self.get_slug(request), method=request.method)
+        if not endpoint_id:
+            return
+
+        # Get or create a subscription (cached per user/endpoint pair)
+        subscription_id = subscription_cache.get_id(user.pk, endpoint_id)
+        self.record(request, response, user.pk, endpoint_id, subscription_id, timing)
+
+    # ---------------------------------
+    # Async path
+    # ---------------------------------
+    async def alog_usage(self, request, response, timing=None):
         if not request.path.startswith("/api/"):
-            return response
+            return
 
-        try:
-            # Resolve URL kwargs (like slug)
-            match = resolve(request.path)
-            slug = match.kwargs.get("slug")
-
-            endpoint_instance = None
-            if slug:
-                endpoint_instance = Endpoint.objects.filter(slug=slug, is_deleted=False).first()
-            if not endpoint_instance:
-                endpoint_instance = Endpoint.objects.filter(url__icontains=request.path, is_deleted=False).first()
-            if not endpoint_instance:
-                return response
-
-            # Get or create a subscription
-            subscription, created = Subscription.objects.get_or_create(
-                user=user,
-                api=endpoint_instance
-            )
+        user = await self.aget_user(request)
+        if not user or not user.is_authenticated:
+            return
+
+        if not endpoint_index.is_fresh():
+            await sync_to_async(endpoint_index.refresh)()
+        endpoint_id = endpoint_index.lookup(request.path, slug=self.get_slug(request), method=request.method)
+        if not endpoint_id:
+            return
+
+        subscription_id = subscription_cache.cached_id(user.pk, endpoint_id)
+        if subscription_id is None:
+            subscription_id = await sync_to_async(subscription_cache.load_id)(user.pk, endpoint_id)
+        self.record(request, response, user.pk, endpoint_id, subscription_id, timing)
 
-            # Safely parse request body
+    @staticmethod
+    async def aget_user(request):
+        """
+        DRF replaces ``request.user`` with the token-authenticated user; only an
+        untouched session user is still lazy and must be loaded via ``auser()``.
+        """
+        user = getattr(request, "user", None)
+        if isinstance(user, SimpleLazyObject) and hasattr(request, "auser"):
+            return await request.auser()
+        return user
+
+    # ---------------------------------
+    # Shared helpers
+    # ---------------------------------
+    @staticmethod
+    def get_slug(request):
+        # Reuse the URL match made by the handler (kwargs like slug)
+        match = getattr(request, "resolver_match", None) or resolve(request.path)
+        return match.kwargs.get("slug")
+
+    def record(self, request, response, user_id, endpoint_id, subscription_id, timing=None):
+        """Queue the usage record and bump the usage counter; never blocks on the DB."""
+        # Bounded, content-type-aware body capture (see USAGE_BODY_CAPTURE)
+        body_data = capture_policy.capture(request, endpoint_id, slug=endpoint_index.slug_for(endpoint_id))
+
+        # Query params
+        query_data = request.GET.dict() if request.GET else {}
+
+        # Wall and DB time (seconds) measured around the view
+        duration_ms = db_duration_ms = latency_bucket = None
+        if timing:
+            duration_ms = round(timing[0] * 1000)
+            db_duration_ms = round(timing[1] * 1000)
+            latency_bucket = LatencySketch.bucket_for(timing[0] * 1000)
+
+        # Queue the usage record; the buffer writes it in batches
+        # off the request thread
+        usage_buffer.push(UsageRecord(
+            subscription_id=subscription_id,
+            status_code=response.status_code,
+            method=request.method,
+            request_body=body_data,
+            query_params=query_data,
+            duration_ms=duration_ms,
+            db_duration_ms=db_duration_ms,
+            latency_bucket=latency_bucket
+        ))
+
+        # Coalesced, atomic increment of subscription.usage_count
+        usage_counter.incr(user_id, endpoint_id)
+
+
+class QuotaMiddleware:
+    """
+    Enforces the caller's plan quotas (requests per minute/day/month) before
+    the view runs. Requests over a limit get a 429 without reaching the view;
+    every metered response carries ``X-RateLimit-*`` headers for the
+    tightest limit.
+
+    The caller is identified from the session or, without a database hit,
+    from the JWT's user id claim (DRF authenticates only later, in the view).
+    """
+    sync_capable = True
+    async_capable = True
+
+    jwt_auth = JWTStatelessUserAuthentication()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "API_QUOTA_ENABLED", True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        decision = self.check(request)
+        if decision is not None and not decision.allowed:
+            return self.rejected(decision)
+        response = self.get_response(request)
+        return self.with_headers(response, decision)
+
+    async def __acall__(self, request):
+        decision = None
+        # Only metered requests pay for the thread hop to the counter store
+        if self.is_metered(request):
+            decision = await sync_to_async(self.check)(request)
+        if decision is not None and not decision.allowed:
+            return self.rejected(decision)
+        response = await self.get_response(request)
+        return self.with_headers(response, decision)
+
+    def is_metered(self, request):
+        """
+        Cheap pre-check without database or counter store access: False when
+        ``check()`` would certainly return None (quotas off or no limits
+        configured, not an API path, anonymous caller, or no such endpoint in
+        a fresh endpoint index).
+        """
+        if not self.enabled or not quota_enforcer.enforces_any() or not request.path.startswith("/api/"):
+            return False
+        if "HTTP_AUTHORIZATION" not in request.META and settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return False
+        if endpoint_index.is_fresh():
             try:
-                body_data = json.loads(request.body.decode("utf-8")) if request.body else {}
-            except Exception:
-                body_data = {}
-
-            # Query params
-            query_data = request.GET.dict() if request.GET else {}
-
-            # Log the API usage
-            Usage.objects.create(
-                subscription=subscription,
-                status_code=response.status_code,
-                method=request.method,
-                request_body=body_data,
-                query_params=query_data
+                slug = APILoggingMiddleware.get_slug(request)
+            except Resolver404:
+                slug = None
+            return endpoint_index.lookup(request.path, slug=slug, method=request.method) is not None
+        return True
+
+    def check(self, request):
+        """RateLimitDecision for a metered request, None otherwise (never raises)."""
+        if not self.enabled or not quota_enforcer.enforces_any() or not request.path.startswith("/api/"):
+            return None
+        try:
+            user_id = self.get_user_id(request)
+            if user_id is None:
+                return None
+            endpoint_id = endpoint_index.resolve(
+                request.path, slug=APILoggingMiddleware.get_slug(request), method=request.method
             )
+            if not endpoint_id:
+                return None
+            return quota_enforcer.check(user_id, endpoint_id)
+        except Exception as e:
+            # Fail open; an unavailable counter store must not take the API down
+            print(f"[QuotaMiddleware] Failed to check quota: {e}")
+            return None
 
-            # Increment usage count on subscription
-            subscription.usage_count += 1
-            subscription.save(update_fields=['usage_count'])
+    def get_user_id(self, request):
+        try:
+            authenticated = self.jwt_auth.authenticate(request)
+        except (InvalidToken, AuthenticationFailed):
+            # Let DRF reject the token in the view
+            return None
+        if authenticated is not None:
+            return str(authenticated[0].pk)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return str(user.pk)
+        return None
 
-        except Exception as e:
-            # Fail silently; logging only
-            print(f"[APILoggingMiddleware] Failed to log API usage: {e}")
+    @staticmethod
+    def rejected(decision):
+        response = JsonResponse(
+            {"success": False, "message": "Request quota exceeded", "errors": None},
+            status=429,
+        )
+        for header, value in rate_limit_headers(decision).items():
+            response[header] = value
+        return response
 
+    @staticmethod
+    def with_headers(response, decision):
+        if decision is not None:
+            for header, value in rate_limit_headers(decision).items():
+                response[header] = value
         return response
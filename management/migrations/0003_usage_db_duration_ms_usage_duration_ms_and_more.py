@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0002_alter_media_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usage',
+            name='db_duration_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Time spent in database calls', null=True),
+        ),
+        migrations.AddField(
+            model_name='usage',
+            name='duration_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Wall time of the request', null=True),
+        ),
+        migrations.AddField(
+            model_name='usage',
+            name='latency_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='LatencySketch bucket of duration_ms', null=True),
+        ),
+    ]
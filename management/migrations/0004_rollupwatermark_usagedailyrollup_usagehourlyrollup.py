@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:09
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0003_usage_db_duration_ms_usage_duration_ms_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('position', models.DateTimeField(blank=True, help_text='created_at of the last row rolled up', null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('day', models.DateField()),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('latency_buckets', models.JSONField(blank=True, default=dict, help_text='LatencySketch bucket counts')),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_usage', to='management.endpoint')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'unique_together': {('endpoint', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageHourlyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('status_class', models.PositiveSmallIntegerField(help_text='HTTP status code // 100')),
+                ('hour', models.DateTimeField()),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('latency_buckets', models.JSONField(blank=True, default=dict, help_text='LatencySketch bucket counts')),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_usage', to='management.endpoint')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_usage', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-hour'],
+                'unique_together': {('endpoint', 'user', 'status_class', 'hour')},
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0004_rollupwatermark_usagedailyrollup_usagehourlyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='mgmt_category_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='endpoint',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='mgmt_endpoint_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='endpoint',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', '-created_at'], name='mgmt_endpoint_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='example',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['api', '-created_at'], name='mgmt_example_api_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['api', '-created_at'], name='mgmt_media_api_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='responsemodel',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['api', 'status_code'], name='mgmt_response_api_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='mgmt_subscription_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usage',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-request_time', '-id'], name='mgmt_usage_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usage',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['request_time', 'subscription', 'latency_bucket', 'db_duration_ms'], name='mgmt_usage_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usage',
+            index=models.Index(fields=['created_at', 'subscription', 'status_code', 'request_time', 'latency_bucket'], name='mgmt_usage_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usagedailyrollup',
+            index=models.Index(fields=['day'], name='mgmt_daily_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usagehourlyrollup',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'endpoint', 'request_count'], name='mgmt_hourly_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usagehourlyrollup',
+            index=models.Index(fields=['hour'], name='mgmt_hourly_hour_idx'),
+        ),
+    ]
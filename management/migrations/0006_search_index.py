@@ -0,0 +1,73 @@
+import html
+import re
+from django.db import DatabaseError, migrations
+from django.utils.html import strip_tags
+
+# Frozen copy of management.search as of this migration: later changes to
+# the live document builder must not change what this migration does
+DOCUMENTS_TABLE = "management_search_document"
+FTS_TABLE = "management_search_fts"
+
+SCHEMA = (
+    f"CREATE TABLE IF NOT EXISTS {DOCUMENTS_TABLE} ("
+    "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, object_id TEXT NOT NULL, UNIQUE (kind, object_id))",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, url, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+)
+DROP_SCHEMA = (
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"DROP TABLE IF EXISTS {DOCUMENTS_TABLE}",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _plain(value):
+    return _WHITESPACE.sub(" ", html.unescape(strip_tags(value or ""))).strip()
+
+
+def _documents(apps):
+    """``(kind, pk, title, url, body)`` for every active catalog row."""
+    for row in apps.get_model("management", "Category").objects.filter(is_deleted=False).iterator():
+        yield "category", row.pk, row.name, "", _plain(row.description)
+    for row in apps.get_model("management", "Endpoint").objects.filter(is_deleted=False).iterator():
+        yield "endpoint", row.pk, row.name, row.url, _plain(row.description)
+    for row in apps.get_model("management", "Example").objects.filter(is_deleted=False).iterator():
+        yield "example", row.pk, f"{row.language} {row.request_type}", "", row.code_snippet or ""
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 tables exist on SQLite only; other vendors keep LIKE search."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+        except DatabaseError as exc:
+            print(f"[SearchIndex] FTS5 unavailable, search falls back to LIKE: {exc}")
+            return
+        documents, index = [], []
+        for rowid, (kind, pk, title, url, body) in enumerate(_documents(apps), start=1):
+            documents.append((rowid, kind, str(pk)))
+            index.append((rowid, title, url, body))
+        cursor.executemany(f"INSERT INTO {DOCUMENTS_TABLE} (id, kind, object_id) VALUES (%s, %s, %s)", documents)
+        cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, url, body) VALUES (%s, %s, %s, %s)", index)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SCHEMA:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0005_category_mgmt_category_active_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
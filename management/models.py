@@ -1,5 +1,6 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 from ckeditor_uploader.fields import RichTextUploadingField
 from accounts.models import User
@@ -17,6 +18,11 @@ class Category(BaseModel):
 
     objects = ActiveManager()
     all_objects = models.Manager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["-created_at"], name="mgmt_category_active_idx", condition=Q(is_deleted=False)),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug and self.name:
@@ -51,6 +57,12 @@ class Endpoint(BaseModel):
 
     objects = ActiveManager()
     all_objects = models.Manager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["-created_at"], name="mgmt_endpoint_active_idx", condition=Q(is_deleted=False)),
+            models.Index(fields=["category", "-created_at"], name="mgmt_endpoint_category_idx", condition=Q(is_deleted=False)),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug and self.name:
@@ -90,6 +102,9 @@ class Example(BaseModel):
 
     class Meta:
         unique_together = ("api", "language", "request_type")
+        indexes = [
+            models.Index(fields=["api", "-created_at"], name="mgmt_example_api_idx", condition=Q(is_deleted=False)),
+        ]
 
     def __str__(self):
         return f"{self.api.name} [{self.language} - {self.request_type}]"
@@ -109,6 +124,9 @@ class ResponseModel(BaseModel):
 
     class Meta:
         ordering = ["status_code"]
+        indexes = [
+            models.Index(fields=["api", "status_code"], name="mgmt_response_api_idx", condition=Q(is_deleted=False)),
+        ]
 
     def __str__(self):
         return f"{self.api.name} - {self.status_code} {self.media_type}"
@@ -127,12 +145,20 @@ class Subscription(BaseModel):
 
     class Meta:
         unique_together = ("user", "api")
+        indexes = [
+            # Keyset pages of the admin list
+            models.Index(fields=["-created_at", "-id"], name="mgmt_subscription_active_idx", condition=Q(is_deleted=False)),
+        ]
 
     def delete(self, using=None, keep_parents=False):
-        """Soft delete subscription and its usage records"""
-        super().delete(using, keep_parents)
-        for usage in self.usage_records.all():
-            usage.delete(using, keep_parents)
+        """Soft delete subscription and its usage records (and their rolled-up counts)"""
+        from management.rollups import retract_usage
+
+        with transaction.atomic():
+            super().delete(using, keep_parents)
+            retract_usage(self.usage_records.all())
+            for usage in self.usage_records.all():
+                usage.delete(using, keep_parents)
 
     def __str__(self):
         return f"{self.user.username} -> {self.api.name}"
@@ -147,10 +173,30 @@ class Usage(BaseModel):
     method = models.CharField(max_length=10, default="GET")
     request_body = models.JSONField(default=dict, blank=True)
     query_params = models.JSONField(default=dict, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Wall time of the request")
+    db_duration_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Time spent in database calls")
+    latency_bucket = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, help_text="LatencySketch bucket of duration_ms")
 
     objects = ActiveManager()
     all_objects = models.Manager()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Keyset pages of the admin list
+            models.Index(fields=["-request_time", "-id"], name="mgmt_usage_active_idx", condition=Q(is_deleted=False)),
+            # Covers latency windows: range on request_time, group by endpoint/bucket
+            models.Index(
+                fields=["request_time", "subscription", "latency_bucket", "db_duration_ms"],
+                name="mgmt_usage_window_idx",
+                condition=Q(is_deleted=False),
+            ),
+            # Rollup slices and archive batches walk all rows by created_at
+            models.Index(
+                fields=["created_at", "subscription", "status_code", "request_time", "latency_bucket"],
+                name="mgmt_usage_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.subscription.user.username} -> {self.subscription.api.name} at {self.request_time}"
 
@@ -165,5 +211,67 @@ class Media(BaseModel):
     objects = ActiveManager()
     all_objects = models.Manager()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["api", "-created_at"], name="mgmt_media_api_idx", condition=Q(is_deleted=False)),
+        ]
+
     def __str__(self):
         return f"{self.api.name} Media: {self.file.name}"
+
+# =========================================================
+# Usage Rollups – materialized analytics maintained by rollup_usage
+# =========================================================
+class UsageHourlyRollup(BaseModel):
+    endpoint = models.ForeignKey(Endpoint, on_delete=models.CASCADE, related_name="hourly_usage")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="hourly_usage")
+    status_class = models.PositiveSmallIntegerField(help_text="HTTP status code // 100")
+    hour = models.DateTimeField()
+    request_count = models.PositiveIntegerField(default=0)
+    latency_buckets = models.JSONField(default=dict, blank=True, help_text="LatencySketch bucket counts")
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        unique_together = ("endpoint", "user", "status_class", "hour")
+        ordering = ["-hour"]
+        indexes = [
+            # Covers per-user totals (UserAPIUsageCountView)
+            models.Index(fields=["user", "endpoint", "request_count"], name="mgmt_hourly_user_idx", condition=Q(is_deleted=False)),
+            models.Index(fields=["hour"], name="mgmt_hourly_hour_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint_id} / {self.user_id} {self.status_class}xx @ {self.hour}: {self.request_count}"
+
+
+class UsageDailyRollup(BaseModel):
+    endpoint = models.ForeignKey(Endpoint, on_delete=models.CASCADE, related_name="daily_usage")
+    day = models.DateField()
+    request_count = models.PositiveIntegerField(default=0)
+    latency_buckets = models.JSONField(default=dict, blank=True, help_text="LatencySketch bucket counts")
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        unique_together = ("endpoint", "day")
+        ordering = ["-day"]
+        indexes = [
+            models.Index(fields=["day"], name="mgmt_daily_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint_id} @ {self.day}: {self.request_count}"
+
+
+class RollupWatermark(BaseModel):
+    name = models.CharField(max_length=50, unique=True)
+    position = models.DateTimeField(null=True, blank=True, help_text="created_at of the last row rolled up")
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
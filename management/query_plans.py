@@ -0,0 +1,118 @@
+import re
+import uuid
+from datetime import timedelta
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from management.models import (
+    Category,
+    Endpoint,
+    Example,
+    Media,
+    ResponseModel,
+    Subscription,
+    Usage,
+    UsageDailyRollup,
+    UsageHourlyRollup,
+)
+
+# Whole-table reads: "SCAN <table> [USING ... INDEX]" (SQLite) / "Seq Scan on <table>" (PostgreSQL).
+# Walking a whole index is only acceptable when a LIMIT stops it early.
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?P<table>\w+)(?P<index> USING .*INDEX .*)?$"),
+    "postgresql": re.compile(r"Seq Scan on (?P<table>\w+)(?P<index>)"),
+}
+# Sorts outside an index: SQLite's temp b-tree, a PostgreSQL Sort node (top-level or nested, not "Sort Key:")
+SORT_PATTERN = re.compile(r"USE TEMP B-TREE FOR ORDER BY|^\s*(?:->\s+)?Sort(?:\s+\(|$)", re.MULTILINE)
+
+
+def full_scans(queryset):
+    """Tables ``queryset`` reads in full according to its plan, and the plan itself."""
+    plan = explain(queryset)
+    return scanned_tables(plan, connection.vendor, limited=queryset.query.high_mark is not None), plan
+
+
+def scanned_tables(plan, vendor, limited=False):
+    """Tables an EXPLAIN ``plan`` of ``vendor`` reads in full."""
+    full_scan = FULL_SCAN_PATTERNS[vendor]
+    return [
+        m.group("table") for m in map(full_scan.search, plan.splitlines())
+        if m and not (m.group("index") and limited)
+    ]
+
+
+def sorts(plan):
+    """True when an EXPLAIN ``plan`` sorts rows instead of reading them in index order."""
+    return SORT_PATTERN.search(plan) is not None
+
+
+def explain(queryset):
+    if connection.vendor != "postgresql":
+        return queryset.explain()
+    # Tiny tables make seq scans cheapest; disable them so only a
+    # missing index can produce one
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+# =========================================================
+# Hot query shapes
+# =========================================================
+def hot_querysets():
+    """``(label, queryset)`` pairs for the query shapes behind the hot paths."""
+    now = timezone.now()
+    since = now - timedelta(hours=24)
+    some_id = uuid.uuid4()
+    keyset = Q(request_time__lt=now) | Q(request_time=now, pk__lt=some_id)
+
+    yield "category list", Category.objects.all()[:10]
+    yield "endpoint list", Endpoint.objects.all()[:10]
+    yield "endpoints by category", Endpoint.objects.filter(category_id=some_id)[:10]
+    yield "examples of endpoint", Example.objects.filter(api_id=some_id)
+    yield "responses of endpoint", ResponseModel.objects.filter(api_id=some_id)
+    yield "media of endpoint", Media.objects.filter(api_id=some_id)
+
+    yield "subscription page", Subscription.objects.order_by("-created_at", "-pk")[:11]
+    yield "subscription lookup", Subscription.all_objects.filter(user_id=some_id, api_id=some_id)
+
+    yield "usage first page", Usage.objects.order_by("-request_time", "-pk")[:11]
+    yield "usage keyset page", Usage.objects.filter(keyset).order_by("-request_time", "-pk")[:11]
+
+    window = Usage.objects.filter(request_time__gte=since, request_time__lt=now, latency_bucket__isnull=False)
+    yield "usage latency window", (
+        window.values_list("subscription__api_id", "latency_bucket").annotate(n=Count("id")).order_by()
+    )
+    yield "usage db time window", (
+        window.values_list("subscription__api_id").annotate(avg_db=Avg("db_duration_ms")).order_by()
+    )
+    yield "usage rollup slice", (
+        Usage.objects
+        .filter(created_at__gt=since, created_at__lte=now)
+        .annotate(hour=TruncHour("request_time"), status_class=F("status_code") / 100)
+        .values_list("subscription__api_id", "subscription__user_id", "status_class", "hour", "latency_bucket")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    yield "usage archive batch", Usage.all_objects.filter(created_at__lt=since).order_by("created_at", "pk")[:5000]
+
+    yield "hourly rollups per user", (
+        UsageHourlyRollup.objects.filter(user_id=some_id)
+        .values("endpoint_id").annotate(total=Sum("request_count")).order_by()
+    )
+    yield "hourly rollup merge", UsageHourlyRollup.all_objects.filter(hour__in=[since, now])
+    yield "daily rollup merge", UsageDailyRollup.all_objects.filter(day__in=[since.date(), now.date()])
+
+    if apps.is_installed("logs"):
+        from logs.models import APIRequestLog
+
+        yield "request log usage_count", (
+            APIRequestLog.objects.filter(user_id=some_id, endpoint_id=some_id, request_time__gte=since)
+            .values("pk").order_by()
+        )
+        yield "request log first page", APIRequestLog.objects.order_by("-request_time", "-pk")[:11]
+        yield "request log keyset page", (
+            APIRequestLog.objects.filter(keyset).order_by("-request_time", "-pk")[:11]
+        )
@@ -0,0 +1,108 @@
+from collections import namedtuple
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from core.caching import LRUCache
+from core.ratelimit import GCRALimiter, QuotaLimiter, RateLimiter
+
+PlanLimits = namedtuple("PlanLimits", "scope requests_per_minute requests_per_day monthly_quota")
+
+LIMIT_FIELDS = ("requests_per_minute", "requests_per_day", "monthly_quota")
+
+# =========================================================
+# QuotaEnforcer – plan limits → rate limiter decisions
+# =========================================================
+class QuotaEnforcer:
+    """
+    Resolves the request limits that apply to a user calling an endpoint and
+    checks them against the shared counter store.
+
+    Limits come from the user's active subscription plan covering the
+    endpoint (the most generous one if several do) and are counted per
+    (user, plan). Users without such a plan, or every user while the
+    subscription app is not installed, get ``API_DEFAULT_QUOTA`` counted per
+    user (unlimited unless configured). Resolved limits are cached
+    in-process for ``plan_cache_ttl`` seconds, so a warm check never touches
+    the database.
+    """
+
+    def __init__(self, store, default_limits=None, plan_cache_ttl=60, max_size=10000):
+        self.store = store
+        self.default_limits = {field: (default_limits or {}).get(field) for field in LIMIT_FIELDS}
+        self._plans = LRUCache(max_size=max_size, ttl=plan_cache_ttl)
+        self._limiters = {}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            store=import_string(getattr(settings, "API_QUOTA_COUNTER_STORE", "core.ratelimit.SQLiteCounterStore"))(),
+            default_limits=getattr(settings, "API_DEFAULT_QUOTA", {}),
+            plan_cache_ttl=getattr(settings, "API_QUOTA_PLAN_CACHE_TTL_SECONDS", 60),
+        )
+
+    def cached_limits(self, user_id, endpoint_id):
+        """Resolved limits for the pair, or None (never touches the database)."""
+        return self._plans.get((user_id, endpoint_id))
+
+    def limits_for(self, user_id, endpoint_id):
+        key = (user_id, endpoint_id)
+        limits = self._plans.get(key)
+        if limits is None:
+            limits = self.resolve_limits(user_id, endpoint_id)
+            self._plans.set(key, limits)
+        return limits
+
+    def enforces_any(self):
+        """False when no limit can apply to anyone: no plans and no default quota."""
+        return apps.is_installed("subscription") or any(self.default_limits.values())
+
+    def resolve_limits(self, user_id, endpoint_id):
+        if apps.is_installed("subscription"):
+            from subscription.models import UserSubscription
+
+            plans = list(
+                UserSubscription.objects
+                .filter(
+                    user_id=user_id,
+                    active=True,
+                    end_date__gt=timezone.now(),
+                    plan__is_active=True,
+                    plan__endpoints=endpoint_id,
+                )
+                .values_list("plan_id", *(f"plan__{field}" for field in LIMIT_FIELDS))
+            )
+            if plans:
+                # Most generous plan wins; None means unlimited
+                plan_id, *limits = max(plans, key=lambda row: tuple(
+                    float("inf") if value is None else value for value in row[1:]
+                ))
+                return PlanLimits(f"{user_id}:{plan_id}", *limits)
+        return PlanLimits(f"{user_id}:default", *(self.default_limits[field] for field in LIMIT_FIELDS))
+
+    def limiter_for(self, limits):
+        values = tuple(getattr(limits, field) for field in LIMIT_FIELDS)
+        limiter = self._limiters.get(values)
+        if limiter is None:
+            rpm, rpd, monthly = values
+            stages = {}
+            if rpm:
+                stages["minute"] = GCRALimiter(rpm, period=60)
+            if rpd:
+                stages["day"] = QuotaLimiter(rpd, window="day")
+            if monthly:
+                stages["month"] = QuotaLimiter(monthly, window="month")
+            limiter = self._limiters[values] = RateLimiter(stages, self.store, prefix="quota")
+        return limiter
+
+    def check(self, user_id, endpoint_id, limits=None):
+        """Count one request; returns a RateLimitDecision, or None when unlimited."""
+        limits = limits or self.limits_for(user_id, endpoint_id)
+        return self.limiter_for(limits).check(limits.scope)
+
+    def clear(self):
+        """Forget resolved limits; counters in the store are kept."""
+        self._plans.clear()
+
+
+quota_enforcer = QuotaEnforcer.from_settings()
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from core.sketches import LatencySketch
+from management.models import RollupWatermark, Usage, UsageDailyRollup, UsageHourlyRollup
+
+WATERMARK_NAME = "usage"
+
+# =========================================================
+# Incremental usage rollups
+# =========================================================
+def roll_up_usage(lag_seconds=60, window_hours=24):
+    """
+    Fold Usage rows created since the watermark into the hourly and daily
+    rollup tables. Rows newer than ``lag_seconds`` are left for the next run
+    so in-flight batches from the usage buffer are not skipped. Work is done
+    in ``window_hours`` slices, each committed together with the watermark.
+    Every slice re-reads the watermark under a row lock, so overlapping runs
+    never fold the same rows twice. Soft-deleted rows are not counted.
+    Returns the number of Usage rows processed.
+    """
+    upto = timezone.now() - timedelta(seconds=lag_seconds)
+    RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+            start = watermark.position
+            if start is None:
+                first = Usage.all_objects.order_by("created_at").values_list("created_at", flat=True).first()
+                if first is None:
+                    return processed
+                start = first - timedelta(microseconds=1)
+            if start >= upto:
+                return processed
+            end = min(start + timedelta(hours=window_hours), upto)
+            processed += _roll_up(Usage.objects.filter(created_at__gt=start, created_at__lte=end))
+            watermark.position = end
+            watermark.save(update_fields=["position", "updated_at"])
+
+
+def retract_usage(usages):
+    """
+    Subtract ``usages`` that were already rolled up from the rollup tables;
+    call it in the transaction that soft-deletes them. Holds the watermark
+    lock, so a concurrent rollup run cannot fold them in meanwhile.
+    Returns the number of Usage rows retracted.
+    """
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(name=WATERMARK_NAME).first()
+        if watermark is None or watermark.position is None:
+            return 0
+        return _roll_up(usages.filter(is_deleted=False, created_at__lte=watermark.position), sign=-1)
+
+
+def _roll_up(usages, sign=1):
+    grouped = (
+        usages
+        .annotate(hour=TruncHour("request_time"), status_class=F("status_code") / 100)
+        .values_list("subscription__api_id", "subscription__user_id", "status_class", "hour", "latency_bucket")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+
+    hourly = defaultdict(lambda: [0, LatencySketch()])
+    daily = defaultdict(lambda: [0, LatencySketch()])
+    processed = 0
+    for endpoint_id, user_id, status_class, hour, bucket, count in grouped:
+        processed += count
+        for totals, key in (
+            (hourly, (endpoint_id, user_id, status_class, hour)),
+            (daily, (endpoint_id, timezone.localdate(hour))),
+        ):
+            totals[key][0] += sign * count
+            if bucket is not None:
+                totals[key][1].add_bucket(bucket, sign * count)
+
+    if hourly:
+        _merge(
+            UsageHourlyRollup,
+            hourly,
+            ("endpoint_id", "user_id", "status_class", "hour"),
+            {"hour__in": {key[3] for key in hourly}},
+        )
+        _merge(
+            UsageDailyRollup,
+            daily,
+            ("endpoint_id", "day"),
+            {"day__in": {key[1] for key in daily}},
+        )
+    return processed
+
+
+def _merge(model, totals, key_fields, scope):
+    """Add ``totals`` onto existing rollup rows, creating the missing ones."""
+    existing = {
+        tuple(getattr(row, field) for field in key_fields): row
+        for row in model.all_objects.filter(**scope)
+    }
+    now = timezone.now()
+    to_create, to_update = [], []
+    for key, (count, sketch) in totals.items():
+        row = existing.get(key)
+        if row is None:
+            if count <= 0:
+                # Retraction of rows that were never rolled up
+                continue
+            to_create.append(model(
+                **dict(zip(key_fields, key)),
+                request_count=count,
+                latency_buckets=sketch.to_dict(),
+            ))
+            continue
+        row.request_count += count
+        row.latency_buckets = LatencySketch.from_dict(row.latency_buckets).merge(sketch).to_dict()
+        row.updated_at = now
+        to_update.append(row)
+    model.all_objects.bulk_create(to_create, batch_size=500)
+    model.all_objects.bulk_update(to_update, ["request_count", "latency_buckets", "updated_at"], batch_size=500)
@@ -0,0 +1,256 @@
+import re
+import threading
+import time
+import uuid
+from urllib.parse import unquote, urlsplit
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from management.models import Endpoint
+
+GENERATION_CACHE_KEY = "management:endpoint-index:generation"
+
+# Path segments such as "{id}", "<slug>" or ":pk" match any single segment
+_PARAM_SEGMENT = re.compile(r"^(\{[^/]+\}|<[^/]+>|:[^/]+)$")
+
+
+def normalize_path(path):
+    """Lowercased, unquoted path without scheme/host, query or trailing slash."""
+    if "://" in path:
+        path = urlsplit(path).path
+    path = unquote(path).split("?", 1)[0].lower().rstrip("/")
+    return path or "/"
+
+
+def split_path(path):
+    return [segment for segment in path.split("/") if segment]
+
+
+# =========================================================
+# Path trie – templated Endpoint URLs ("/users/{id}/posts")
+# =========================================================
+class _TrieNode:
+    __slots__ = ("children", "wildcard", "endpoints")
+
+    def __init__(self):
+        self.children = {}
+        self.wildcard = None
+        self.endpoints = {}
+
+
+class PathTrie:
+    """Segment trie where parameter segments match any single path segment."""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, segments, endpoint_id, entry):
+        node = self.root
+        for segment in segments:
+            if _PARAM_SEGMENT.match(segment):
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.endpoints[endpoint_id] = entry
+
+    def remove(self, segments, endpoint_id):
+        node = self.root
+        for segment in segments:
+            node = node.wildcard if _PARAM_SEGMENT.match(segment) else node.children.get(segment)
+            if node is None:
+                return
+        node.endpoints.pop(endpoint_id, None)
+
+    def match(self, segments):
+        """Endpoints of the first terminal node matching ``segments`` (static segments win)."""
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == len(segments):
+                if node.endpoints:
+                    return node.endpoints
+                continue
+            if node.wildcard is not None:
+                stack.append((node.wildcard, depth + 1))
+            child = node.children.get(segments[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+        return None
+
+
+class _IndexState:
+    """The lookup structures of one EndpointIndex build."""
+
+    __slots__ = ("by_slug", "by_path", "trie", "entries")
+
+    def __init__(self):
+        self.by_slug = {}
+        self.by_path = {}
+        self.trie = PathTrie()
+        self.entries = {}
+
+    def add(self, endpoint_id, slug, url, method, created_at):
+        path = normalize_path(url)
+        segments = split_path(path)
+        entry = (method, created_at)
+        if any(_PARAM_SEGMENT.match(segment) for segment in segments):
+            self.trie.insert(segments, endpoint_id, entry)
+        else:
+            self.by_path.setdefault(path, {})[endpoint_id] = entry
+        if slug:
+            self.by_slug[slug] = endpoint_id
+        self.entries[endpoint_id] = (slug, path, segments)
+
+    def discard(self, endpoint_id):
+        previous = self.entries.pop(endpoint_id, None)
+        if previous is None:
+            return
+        slug, path, segments = previous
+        if self.by_slug.get(slug) == endpoint_id:
+            del self.by_slug[slug]
+        candidates = self.by_path.get(path)
+        if candidates is not None:
+            candidates.pop(endpoint_id, None)
+            if not candidates:
+                del self.by_path[path]
+        self.trie.remove(segments, endpoint_id)
+
+# =========================================================
+# EndpointIndex – request path / slug → Endpoint id
+# =========================================================
+class EndpointIndex:
+    """
+    In-memory index used by the logging middleware to map a request to an
+    Endpoint without touching the database.
+
+    Plain URLs live in an exact-match dict keyed by normalized path, templated
+    URLs in a ``PathTrie``. The index is loaded lazily, patched in place by the
+    Endpoint signals and rebuilt when the shared generation in the cache was
+    bumped by another process. A rebuild fills new structures and publishes
+    them with one reference swap, so lookups (which take no lock) never see
+    a half-built index.
+
+    The generation only reaches other processes through a shared cache
+    backend, so correctness does not rely on it: at most every ``max_age``
+    seconds the index is also checked against the database (count and
+    latest ``updated_at`` of all endpoints, one aggregate query) and rebuilt
+    when that changed.
+    """
+
+    def __init__(self, max_age=5):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._generation = None
+        self._db_version = None
+        self._checked_at = 0.0
+        self.version = 0
+        self._state = _IndexState()
+
+    # ---------------------------------
+    # Building
+    # ---------------------------------
+    @classmethod
+    def from_settings(cls):
+        return cls(max_age=getattr(settings, "ENDPOINT_INDEX_MAX_AGE_SECONDS", 5))
+
+    @staticmethod
+    def db_version():
+        """Changes whenever an endpoint is created, saved, soft- or hard-deleted."""
+        state = Endpoint.all_objects.aggregate(count=Count("pk"), updated=Max("updated_at"))
+        return (state["count"], state["updated"])
+
+    def rebuild(self):
+        """Reload every active endpoint (two queries)."""
+        # Read the version first: a change while loading only causes another rebuild
+        db_version = self.db_version()
+        state = _IndexState()
+        for row in Endpoint.objects.values_list("id", "slug", "url", "method", "created_at"):
+            state.add(*row)
+        with self._lock:
+            self._state = state
+            self._generation = cache.get(GENERATION_CACHE_KEY)
+            self._db_version = db_version
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            self.version += 1
+
+    def update(self, endpoint):
+        """Re-index one endpoint after it was saved, soft-deleted or restored."""
+        with self._lock:
+            if self._loaded:
+                self._state.discard(endpoint.pk)
+                if not endpoint.is_deleted:
+                    self._state.add(endpoint.pk, endpoint.slug, endpoint.url, endpoint.method, endpoint.created_at)
+                self.version += 1
+            self._publish()
+
+    def remove(self, endpoint_id):
+        """Drop an endpoint after a hard delete."""
+        with self._lock:
+            if self._loaded:
+                self._state.discard(endpoint_id)
+                self.version += 1
+            self._publish()
+
+    def _publish(self):
+        """Bump the shared generation so other processes rebuild their copy."""
+        generation = uuid.uuid4().hex
+        cache.set(GENERATION_CACHE_KEY, generation, None)
+        if self._loaded:
+            self._generation = generation
+
+    def is_fresh(self):
+        """False when the index must be refreshed before it can answer lookups."""
+        return (
+            self._loaded
+            and time.monotonic() - self._checked_at < self.max_age
+            and cache.get(GENERATION_CACHE_KEY) == self._generation
+        )
+
+    def refresh(self):
+        """Rebuild unless the database still matches the loaded index."""
+        if self._loaded and cache.get(GENERATION_CACHE_KEY) == self._generation:
+            if self.db_version() == self._db_version:
+                self._checked_at = time.monotonic()
+                return
+        self.rebuild()
+
+    # ---------------------------------
+    # Lookup
+    # ---------------------------------
+    def resolve(self, path, slug=None, method=None):
+        """Return the id of the Endpoint serving ``path`` (or named by ``slug``)."""
+        if not self.is_fresh():
+            self.refresh()
+        return self.lookup(path, slug=slug, method=method)
+
+    def lookup(self, path, slug=None, method=None):
+        """Like ``resolve()`` but never touches the database (for async callers)."""
+        state = self._state
+        if slug and slug in state.by_slug:
+            return state.by_slug[slug]
+
+        normalized = normalize_path(path)
+        candidates = state.by_path.get(normalized) or state.trie.match(split_path(normalized))
+        if not candidates:
+            return None
+        return self._pick(candidates, method)
+
+    def slug_for(self, endpoint_id):
+        entry = self._state.entries.get(endpoint_id)
+        return entry[0] if entry else None
+
+    @staticmethod
+    def _pick(candidates, method):
+        """Prefer an endpoint declared for ``method``, then the newest one."""
+        items = list(candidates.items())
+        if method:
+            same_method = [item for item in items if item[1][0] == method]
+            items = same_method or items
+        return max(items, key=lambda item: item[1][1])[0]
+
+
+endpoint_index = EndpointIndex.from_settings()
@@ -0,0 +1,223 @@
+import html
+import re
+from collections import namedtuple
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.html import strip_tags
+from rest_framework.filters import SearchFilter
+from management.models import Category, Endpoint, Example
+
+DOCUMENTS_TABLE = "management_search_document"
+FTS_TABLE = "management_search_fts"
+
+# FTS5 rowids are integers; the documents table maps them to (kind, UUID)
+SCHEMA = (
+    f"CREATE TABLE IF NOT EXISTS {DOCUMENTS_TABLE} ("
+    "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, object_id TEXT NOT NULL, UNIQUE (kind, object_id))",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, url, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+)
+DROP_SCHEMA = (
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"DROP TABLE IF EXISTS {DOCUMENTS_TABLE}",
+)
+
+# bm25() weights for the title, url and body columns
+COLUMN_WEIGHTS = (10.0, 4.0, 1.0)
+
+SearchHit = namedtuple("SearchHit", "object_id rank highlight")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def strip_markup(value):
+    """Plain text of a rich-text (CKEditor) field."""
+    return _WHITESPACE.sub(" ", html.unescape(strip_tags(value or ""))).strip()
+
+
+def build_document(kind, instance):
+    """``(title, url, body)`` indexed for a catalog row of ``kind``."""
+    if kind == "endpoint":
+        return instance.name, instance.url, strip_markup(instance.description)
+    if kind == "category":
+        return instance.name, "", strip_markup(instance.description)
+    if kind == "example":
+        return f"{instance.language} {instance.request_type}", "", instance.code_snippet or ""
+    raise ValueError(f"Unknown search document kind '{kind}'")
+
+
+def build_match(terms):
+    """
+    FTS5 query for user-supplied terms: every word must match, each as a
+    quoted prefix so FTS5 operators and punctuation in the input are inert.
+    """
+    words = [word for term in terms for word in _WORD.findall(term)]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def create_schema(cursor):
+    """Create the search tables; False when SQLite lacks FTS5."""
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+    except DatabaseError as exc:
+        print(f"[SearchIndex] FTS5 unavailable, search falls back to LIKE: {exc}")
+        return False
+    return True
+
+# =========================================================
+# SearchIndex – SQLite FTS5 index over the public catalog
+# =========================================================
+class SearchIndex:
+    """
+    Full-text index of categories, endpoints and examples in an FTS5
+    virtual table of the default database, ranked with bm25(). Rows are
+    written in the same transaction as the model save that triggers them,
+    so the index never sees data that was rolled back. On other database
+    vendors (or SQLite builds without FTS5) ``available`` is False and
+    callers fall back to plain ``LIKE`` search.
+    """
+
+    def __init__(self, sources=None):
+        # kind -> callable returning the queryset of indexable rows
+        self.sources = sources or {}
+        self._available = False
+
+    @property
+    def available(self):
+        if not self._available and connection.vendor == "sqlite":
+            # Only a positive answer is cached: the table may be migrated later
+            self._available = FTS_TABLE in connection.introspection.table_names()
+        return self._available
+
+    # ---------------------------------
+    # Writes
+    # ---------------------------------
+    def update(self, kind, instance):
+        if not self.available:
+            return
+        if instance.is_deleted:
+            self.remove(kind, instance.pk)
+            return
+        title, url, body = build_document(kind, instance)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {DOCUMENTS_TABLE} (kind, object_id) VALUES (%s, %s) "
+                "ON CONFLICT (kind, object_id) DO NOTHING",
+                [kind, str(instance.pk)],
+            )
+            cursor.execute(
+                f"SELECT id FROM {DOCUMENTS_TABLE} WHERE kind = %s AND object_id = %s", [kind, str(instance.pk)]
+            )
+            rowid = cursor.fetchone()[0]
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [rowid])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, url, body) VALUES (%s, %s, %s, %s)",
+                [rowid, title, url, body],
+            )
+
+    def remove(self, kind, object_id):
+        if not self.available:
+            return
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {DOCUMENTS_TABLE} WHERE kind = %s AND object_id = %s", [kind, str(object_id)]
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [row[0]])
+            cursor.execute(f"DELETE FROM {DOCUMENTS_TABLE} WHERE id = %s", [row[0]])
+
+    def rebuild(self, sources=None):
+        """
+        Re-index every active row from scratch; returns ``{kind: rows}``.
+        ``sources`` overrides ``self.sources``.
+        """
+        counts = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not create_schema(cursor):
+                return counts
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"DELETE FROM {DOCUMENTS_TABLE}")
+            rowid = 0
+            for kind, source in (sources or self.sources).items():
+                documents, index = [], []
+                for instance in source().iterator():
+                    rowid += 1
+                    documents.append((rowid, kind, str(instance.pk)))
+                    index.append((rowid, *build_document(kind, instance)))
+                cursor.executemany(
+                    f"INSERT INTO {DOCUMENTS_TABLE} (id, kind, object_id) VALUES (%s, %s, %s)", documents
+                )
+                cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, title, url, body) VALUES (%s, %s, %s, %s)", index)
+                counts[kind] = len(documents)
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        return counts
+
+    # ---------------------------------
+    # Queries
+    # ---------------------------------
+    def search(self, kind, terms, limit=200, mark=("<mark>", "</mark>"), snippet_tokens=16):
+        """Best ``limit`` hits of ``kind`` for ``terms``, most relevant first."""
+        match = build_match(terms)
+        if not match:
+            return []
+        start, end = mark
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT d.object_id, bm25({FTS_TABLE}, %s, %s, %s) AS rank, "
+                f"highlight({FTS_TABLE}, 0, %s, %s), highlight({FTS_TABLE}, 1, %s, %s), "
+                f"snippet({FTS_TABLE}, 2, %s, %s, '…', %s) "
+                f"FROM {FTS_TABLE} JOIN {DOCUMENTS_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s "
+                "ORDER BY rank LIMIT %s",
+                [*COLUMN_WEIGHTS, start, end, start, end, start, end, snippet_tokens, match, kind, limit],
+            )
+            rows = cursor.fetchall()
+        # bm25() is negative, lower is better; expose a positive score
+        return [
+            SearchHit(object_id, round(-rank, 6), {"title": title, "url": url, "snippet": snippet})
+            for object_id, rank, title, url, snippet in rows
+        ]
+
+# =========================================================
+# FullTextSearchFilter – ranked ?search= for catalog views
+# =========================================================
+class FullTextSearchFilter(SearchFilter):
+    """
+    ``?search=`` backed by the FTS5 index for views that declare a
+    ``search_kind``: results are restricted to the hits and ordered by bm25
+    rank (an explicit ``?ordering=`` still wins), and the hits are stored on
+    ``request.search_hits`` for the serializer to add highlights. Views
+    without a ``search_kind``, and databases without the index, get DRF's
+    ``SearchFilter`` over ``search_fields``.
+    """
+
+    max_hits = 200
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, "search_kind", None)
+        terms = self.get_search_terms(request)
+        if not terms or kind is None or not build_match(terms) or not search_index.available:
+            return super().filter_queryset(request, queryset, view)
+
+        hits = search_index.search(kind, terms, limit=self.max_hits)
+        request.search_hits = {hit.object_id: hit for hit in hits}
+        if not hits:
+            return queryset.none()
+        position = Case(
+            *[When(pk=hit.object_id, then=Value(index)) for index, hit in enumerate(hits)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=list(request.search_hits)).annotate(search_position=position).order_by(
+            "search_position"
+        )
+
+
+search_index = SearchIndex(sources={
+    "category": Category.objects.all,
+    "endpoint": Endpoint.objects.all,
+    "example": Example.objects.all,
+})
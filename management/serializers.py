@@ -1,11 +1,33 @@
 from rest_framework import serializers
+from core.sparse import SparseFieldsetSerializerMixin
 from accounts.models import User
 from management.models import Category, Endpoint, Example, ResponseModel, Media, Usage, Subscription
 
+# ----------------------------
+# Full-text search hits
+# ----------------------------
+class SearchHitMixin:
+    """
+    Adds ``search: {rank, highlight}`` to top-level objects that matched a
+    full-text ``?search=`` (see management.search.FullTextSearchFilter).
+    Output is unchanged for any other request.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        hits = getattr(self.context.get("request"), "search_hits", None)
+        root = self.root
+        if not hits or (root is not self and getattr(root, "child", None) is not self):
+            return data
+        hit = hits.get(str(instance.pk))
+        if hit is not None:
+            data["search"] = {"rank": hit.rank, "highlight": hit.highlight}
+        return data
+
 # ----------------------------
 # Category Serializer
 # ----------------------------
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, SearchHitMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'icon']
@@ -14,7 +36,7 @@ class CategorySerializer(serializers.ModelSerializer):
 # ----------------------------
 # Endpoint Serializer (basic for list/create)
 # ----------------------------
-class EndpointSerializer(serializers.ModelSerializer):
+class EndpointSerializer(SparseFieldsetSerializerMixin, SearchHitMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(),
@@ -34,7 +56,7 @@ class EndpointSerializer(serializers.ModelSerializer):
 # ----------------------------
 # Example Serializer
 # ----------------------------
-class ExampleSerializer(serializers.ModelSerializer):
+class ExampleSerializer(SparseFieldsetSerializerMixin, SearchHitMixin, serializers.ModelSerializer):
     api = EndpointSerializer(read_only=True)
     api_id = serializers.PrimaryKeyRelatedField(
         queryset=Endpoint.objects.all(),
@@ -50,7 +72,7 @@ class ExampleSerializer(serializers.ModelSerializer):
 # ----------------------------
 # Response Serializer
 # ----------------------------
-class ResponseSerializer(serializers.ModelSerializer):
+class ResponseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     api = EndpointSerializer(read_only=True)
     api_id = serializers.PrimaryKeyRelatedField(
         queryset=Endpoint.objects.all(),
@@ -66,7 +88,7 @@ class ResponseSerializer(serializers.ModelSerializer):
 # ----------------------------
 # Subscription Serializer
 # ----------------------------
-class SubscriptionSerializer(serializers.ModelSerializer):
+class SubscriptionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     api_name = serializers.CharField(source='api.name', read_only=True)
     api_slug = serializers.CharField(source='api.slug', read_only=True)
@@ -92,7 +114,7 @@ class SubscriptionSerializer(serializers.ModelSerializer):
 # ----------------------------
 # Usage Serializer
 # ----------------------------
-class UsageSerializer(serializers.ModelSerializer):
+class UsageSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     user = serializers.CharField(source='subscription.user.username', read_only=True)
     api_name = serializers.CharField(source='subscription.api.name', read_only=True)
     api_slug = serializers.CharField(source='subscription.api.slug', read_only=True)
@@ -109,7 +131,7 @@ class UsageSerializer(serializers.ModelSerializer):
 # ----------------------------
 # Media Serializer
 # ----------------------------
-class MediaSerializer(serializers.ModelSerializer):
+class MediaSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     api_id = serializers.PrimaryKeyRelatedField(
         queryset=Endpoint.objects.all(),
         source='api' 
@@ -123,14 +145,38 @@ class MediaSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'api']
 
 
+# ----------------------------
+# Slim child serializers (nested under their Endpoint)
+# ----------------------------
+class EndpointExampleSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Example
+        fields = ['id', 'language', 'request_type', 'code_snippet']
+        read_only_fields = fields
+
+
+class EndpointResponseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ResponseModel
+        fields = ['id', 'status_code', 'media_type', 'headers', 'body']
+        read_only_fields = fields
+
+
+class EndpointMediaSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Media
+        fields = ['id', 'file', 'description']
+        read_only_fields = fields
+
 # ----------------------------
 # Endpoint Detail Serializer (for retrieve)
 # ----------------------------
-class EndpointDetailSerializer(serializers.ModelSerializer):
+class EndpointDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Children are expected to be prefetched (see EndpointViewSet.get_queryset)."""
     category = CategorySerializer(read_only=True)
-    examples = ExampleSerializer(many=True, read_only=True)
-    responses = ResponseSerializer(many=True, read_only=True)
-    media = MediaSerializer(many=True, read_only=True)
+    examples = EndpointExampleSerializer(many=True, read_only=True)
+    responses = EndpointResponseSerializer(many=True, read_only=True)
+    media = EndpointMediaSerializer(many=True, read_only=True)
 
     class Meta:
         model = Endpoint
@@ -140,3 +186,10 @@ class EndpointDetailSerializer(serializers.ModelSerializer):
             'examples', 'responses', 'media'
         ]
         read_only_fields = ['id', 'slug', 'examples', 'responses', 'media']
+
+# ----------------------------
+# Catalog snapshot entry
+# ----------------------------
+class SnapshotEndpointSerializer(EndpointDetailSerializer):
+    """Endpoint detail for the catalog snapshot; categories are listed once and referenced by id."""
+    category = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -0,0 +1,75 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from management.catalog_cache import catalog_cache
+from management.models import Category, Endpoint, Example, Media, ResponseModel, Subscription
+from management.routing import endpoint_index
+from management.search import search_index
+from management.subscription_cache import subscription_cache
+
+# =========================================================
+# Endpoint index maintenance
+# =========================================================
+@receiver(post_save, sender=Endpoint)
+def reindex_endpoint(sender, instance, **kwargs):
+    """Keep the middleware's route index in sync with saves, soft deletes and restores."""
+    endpoint_index.update(instance)
+
+
+@receiver(post_delete, sender=Endpoint)
+def unindex_endpoint(sender, instance, **kwargs):
+    endpoint_index.remove(instance.pk)
+
+
+# =========================================================
+# Subscription cache invalidation
+# =========================================================
+@receiver(post_save, sender=Subscription)
+def evict_deleted_subscription(sender, instance, **kwargs):
+    """Soft deletes (including the cascade from Endpoint.delete) drop the cached id."""
+    if instance.is_deleted:
+        subscription_cache.invalidate(instance.user_id, instance.api_id)
+
+
+@receiver(post_delete, sender=Subscription)
+def evict_removed_subscription(sender, instance, **kwargs):
+    subscription_cache.invalidate(instance.user_id, instance.api_id)
+
+
+# =========================================================
+# Catalog response cache invalidation
+# =========================================================
+CATALOG_MODELS = (Category, Endpoint, Example, ResponseModel, Media)
+
+
+def bump_catalog_version(sender, **kwargs):
+    """
+    Any save (including soft delete/restore) or delete of catalog data. The
+    version (response cache and snapshot) is read from the database; this
+    only makes the current process re-read it at once.
+    """
+    catalog_cache.bump()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(bump_catalog_version, sender=model, dispatch_uid=f"catalog_save_{model.__name__}")
+    post_delete.connect(bump_catalog_version, sender=model, dispatch_uid=f"catalog_delete_{model.__name__}")
+
+
+# =========================================================
+# Full-text search index maintenance
+# =========================================================
+SEARCH_KINDS = {Category: "category", Endpoint: "endpoint", Example: "example"}
+
+
+def reindex_search_document(sender, instance, **kwargs):
+    """Saves re-index the row; soft deletes drop it and restores bring it back."""
+    search_index.update(SEARCH_KINDS[sender], instance)
+
+
+def unindex_search_document(sender, instance, **kwargs):
+    search_index.remove(SEARCH_KINDS[sender], instance.pk)
+
+
+for model in SEARCH_KINDS:
+    post_save.connect(reindex_search_document, sender=model, dispatch_uid=f"search_save_{model.__name__}")
+    post_delete.connect(unindex_search_document, sender=model, dispatch_uid=f"search_delete_{model.__name__}")
@@ -0,0 +1,142 @@
+import hashlib
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max, Prefetch
+from django.utils.http import quote_etag
+from core.content_encoding import SUPPORTED_ENCODINGS, compress
+from core.renderers import FastJSONRenderer
+from management.catalog_cache import catalog_fingerprint
+from management.models import Category, Endpoint, Example, Media, ResponseModel
+from management.serializers import CategorySerializer, SnapshotEndpointSerializer
+
+# =========================================================
+# CatalogSnapshot – the whole public catalog as one document
+# =========================================================
+class CatalogSnapshot:
+    """
+    ``{"categories": [...], "endpoints": [...]}`` with every active category
+    and every active endpoint including its examples, responses and media,
+    stored pre-compressed in each supported content encoding.
+
+    Versions come from the database, not from process-local state: the
+    document is keyed by ``catalog_fingerprint`` (row count and latest
+    ``updated_at`` of each catalog table, soft-deleted rows included) and
+    each endpoint's JSON fragment by the same digest over the endpoint and
+    its children. A change in any worker therefore reaches every worker
+    within the fingerprint's max age, and a build re-renders only the
+    fragments whose endpoint changed.
+
+    A miss on the request path compresses at ``fast_*`` levels; the
+    ``build_catalog_snapshot`` command rebuilds the current document at the
+    best levels off the request path (e.g. after deploys, from cron).
+    """
+
+    renderer = FastJSONRenderer()
+    chunk_size = 500
+    child_models = (Example, ResponseModel, Media)
+
+    def __init__(
+        self, namespace="catalog:snapshot", alias="default", timeout=86400,
+        gzip_level=9, brotli_quality=11, fast_gzip_level=6, fast_brotli_quality=5,
+    ):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self.levels = {"best": (gzip_level, brotli_quality), "fast": (fast_gzip_level, fast_brotli_quality)}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            alias=getattr(settings, "CATALOG_CACHE_ALIAS", "default"),
+            timeout=getattr(settings, "CATALOG_SNAPSHOT_TIMEOUT", 86400),
+        )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    # ---------------------------------
+    # Versions
+    # ---------------------------------
+    def fingerprint(self):
+        return catalog_fingerprint.value()
+
+    def endpoint_fingerprints(self):
+        """``{endpoint id: digest}`` over each endpoint row and its children."""
+        children = defaultdict(list)
+        for model in self.child_models:
+            for api_id, count, updated in (
+                model.all_objects.values_list("api_id").annotate(count=Count("pk"), updated=Max("updated_at")).order_by()
+            ):
+                children[api_id].append((model.__name__, count, updated))
+        return {
+            pk: _digest([updated, sorted(children[pk])])
+            for pk, updated in Endpoint.objects.values_list("pk", "updated_at")
+        }
+
+    # ---------------------------------
+    # Build
+    # ---------------------------------
+    def get(self):
+        """The current artifact, built (incrementally, fast compression) on a miss."""
+        fingerprint = self.fingerprint()
+        artifact = self.cache.get(f"{self.namespace}:artifact:{fingerprint}")
+        if artifact is None:
+            artifact = self.build(fingerprint, compression="fast")
+        return artifact
+
+    def build(self, fingerprint=None, compression="best"):
+        # Read the versions before querying: data changed mid-build only orphans these entries
+        fingerprint = fingerprint or self.fingerprint()
+        versions = self.endpoint_fingerprints()
+        endpoint_ids = list(versions)
+        fragment_keys = {pk: f"{self.namespace}:fragment:{pk}:{versions[pk]}" for pk in endpoint_ids}
+        fragments = self.cache.get_many(list(fragment_keys.values()))
+
+        missing = [pk for pk in endpoint_ids if fragment_keys[pk] not in fragments]
+        for start in range(0, len(missing), self.chunk_size):
+            rendered = {
+                fragment_keys[endpoint.pk]: self.renderer.render(SnapshotEndpointSerializer(endpoint).data)
+                for endpoint in self.endpoint_queryset().filter(pk__in=missing[start:start + self.chunk_size])
+            }
+            self.cache.set_many(rendered, self.timeout)
+            fragments.update(rendered)
+
+        categories = self.renderer.render(CategorySerializer(Category.objects.all(), many=True).data)
+        endpoints = b",".join(fragments[fragment_keys[pk]] for pk in endpoint_ids if fragment_keys[pk] in fragments)
+        document = b'{"categories":' + categories + b',"endpoints":[' + endpoints + b"]}"
+
+        gzip_level, brotli_quality = self.levels[compression]
+        content = {"identity": document}
+        for coding in SUPPORTED_ENCODINGS:
+            content[coding] = compress(document, coding, gzip_level=gzip_level, brotli_quality=brotli_quality)
+        artifact = {
+            "etag": _etag(document),
+            # Strong validators: each encoding's bytes differ with the compression level
+            "etags": {coding: _etag(body) for coding, body in content.items()},
+            "endpoints": len(endpoint_ids),
+            "rebuilt": len(missing),
+            "compression": compression,
+            "content": content,
+        }
+        self.cache.set(f"{self.namespace}:artifact:{fingerprint}", artifact, self.timeout)
+        return artifact
+
+    def endpoint_queryset(self):
+        return Endpoint.objects.prefetch_related(
+            Prefetch("examples", queryset=Example.objects.all()),
+            Prefetch("responses", queryset=ResponseModel.objects.all()),
+            Prefetch("media", queryset=Media.objects.all()),
+        )
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode()).hexdigest()
+
+
+def _etag(content):
+    return quote_etag(hashlib.sha1(content).hexdigest())
+
+
+catalog_snapshot = CatalogSnapshot.from_settings()
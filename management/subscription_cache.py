@@ -0,0 +1,56 @@
+from django.conf import settings
+from core.caching import LRUCache
+from management.models import Subscription
+
+# =========================================================
+# SubscriptionCache – (user_id, endpoint_id) → subscription id
+# =========================================================
+class SubscriptionCache:
+    """
+    Remembers which subscription links a user to an endpoint so the logging
+    middleware only hits the database the first time a pair is seen (or after
+    the entry expired, was evicted or invalidated by a soft delete).
+
+    Invalidation comes from model signals in this process only; in other
+    worker processes an entry for a deleted subscription lives until ``ttl``
+    expires, which bounds cross-worker staleness.
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_size=getattr(settings, "SUBSCRIPTION_CACHE_MAX_SIZE", 10000),
+            ttl=getattr(settings, "SUBSCRIPTION_CACHE_TTL_SECONDS", 300),
+        )
+
+    def cached_id(self, user_id, endpoint_id):
+        """Cached subscription id for the pair, or None (never touches the database)."""
+        return self._cache.get((user_id, endpoint_id))
+
+    def get_id(self, user_id, endpoint_id):
+        """Subscription id for the pair, creating the subscription on first use."""
+        subscription_id = self.cached_id(user_id, endpoint_id)
+        if subscription_id is None:
+            subscription_id = self.load_id(user_id, endpoint_id)
+        return subscription_id
+
+    def load_id(self, user_id, endpoint_id):
+        """Fetch (or create) the pair's subscription after a cache miss and cache its id."""
+        subscription, created = Subscription.objects.get_or_create(user_id=user_id, api_id=endpoint_id)
+        self._cache.set((user_id, endpoint_id), subscription.pk)
+        return subscription.pk
+
+    def invalidate(self, user_id, endpoint_id):
+        self._cache.delete((user_id, endpoint_id))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+subscription_cache = SubscriptionCache.from_settings()
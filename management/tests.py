@@ -1,3 +1,355 @@
-from django.test import TestCase
+import sys
+import threading
+import unittest
+from unittest import mock
+from django.apps import apps
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from core.fast_serializers import FastSerializer
+from management.analytics import parse_window
+from management.catalog_cache import catalog_cache
+from management.counters import UsageCounter
+from management.models import Category, Endpoint, Example, Media, ResponseModel, Subscription
+from management.routing import EndpointIndex
+from management.query_plans import FULL_SCAN_PATTERNS, full_scans, hot_querysets, scanned_tables, sorts
+from management.serializers import EndpointSerializer
+from management.views import EndpointViewSet
 
-# Create your tests here.
+
+def create_subscription(tag="test"):
+    user = User.objects.create_user(username=f"{tag}-user", email=f"{tag}@example.com")
+    category = Category.objects.create(name=f"{tag} category")
+    endpoint = Endpoint.objects.create(
+        category=category, name=f"{tag} endpoint", method="GET", url=f"https://example.com/{tag}/"
+    )
+    return Subscription.objects.create(user=user, api=endpoint)
+
+# =========================================================
+# UsageCounter
+# =========================================================
+class UsageCounterConcurrencyTests(TransactionTestCase):
+    """Concurrent increments and flushes must add up to the exact total."""
+
+    threads = 8
+    increments = 500
+
+    def test_concurrent_increments_are_not_lost(self):
+        subscription = create_subscription("counter")
+        counter = UsageCounter(flush_interval_ms=10)
+        user_id, endpoint_id = subscription.user_id, subscription.api_id
+        errors = []
+
+        def work():
+            try:
+                for i in range(self.increments):
+                    counter.incr(user_id, endpoint_id)
+                    if i % 97 == 0:
+                        counter.flush()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=work) for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        counter.flusher.stop()
+        # Deltas that hit a locked table were merged back; drain them
+        for _ in range(100):
+            if not counter.pending():
+                break
+            counter.flush()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(counter.pending(), 0)
+        subscription.refresh_from_db()
+        self.assertEqual(subscription.usage_count, self.threads * self.increments)
+
+# =========================================================
+# Analytics windows
+# =========================================================
+class ParseWindowTests(SimpleTestCase):
+    """Malformed windows fail with a message meant for the API client."""
+
+    def assertRejected(self, params, message):
+        with self.assertRaisesMessage(ValueError, message):
+            parse_window(params)
+
+    def test_bad_hours(self):
+        for hours in ("abc", "-1", "0", "nan", "inf", "1e20"):
+            self.assertRejected({"hours": hours}, "hours must be a positive number")
+
+    def test_bad_datetimes(self):
+        self.assertRejected({"since": "yesterday"}, "since must be an ISO 8601 datetime")
+        self.assertRejected({"until": "2024-13-45T00:00:00"}, "until must be an ISO 8601 datetime")
+        self.assertRejected({"since": "2024-02-01T00:00:00Z", "until": "2024-01-01T00:00:00Z"}, "since must be earlier")
+
+    def test_hours(self):
+        since, until = parse_window({"hours": "1.5"})
+        self.assertEqual((until - since).total_seconds(), 5400)
+
+# =========================================================
+# EndpointIndex
+# =========================================================
+class EndpointIndexTests(TestCase):
+    """Lookups never see a half-built index while it is rebuilt."""
+
+    def test_lookup_during_rebuild(self):
+        category = Category.objects.create(name="index")
+        for i in range(200):
+            Endpoint.objects.create(category=category, name=f"index-{i}", method="GET", url=f"https://example.com/{i}/")
+        index = EndpointIndex()
+        index.rebuild()
+        rows = list(Endpoint.objects.order_by("created_at").values_list("id", "slug", "url", "method", "created_at"))
+        done = threading.Event()
+
+        def rebuild():
+            for _ in range(200):
+                index.rebuild()
+            done.set()
+
+        misses = 0
+        interval = sys.getswitchinterval()
+        # Switch threads often enough to land lookups in the middle of rebuilds
+        sys.setswitchinterval(1e-6)
+        # Same rows as the database, without a connection in the rebuilding thread
+        with mock.patch.object(EndpointIndex, "db_version", return_value=(0, None)), \
+                mock.patch.object(Endpoint.objects, "values_list", return_value=rows):
+            worker = threading.Thread(target=rebuild)
+            worker.start()
+            try:
+                while not done.is_set():
+                    misses += index.lookup("https://example.com/199/") is None
+            finally:
+                worker.join()
+                sys.setswitchinterval(interval)
+        self.assertEqual(misses, 0)
+
+# =========================================================
+# Catalog query budgets
+# =========================================================
+class CatalogQueryBudgetTests(TestCase):
+    """
+    Public catalog views run the same number of queries on a cold cache
+    whether they render 5 or 50 children: the conditional-GET validators
+    (one aggregate, plus one per child table for the detail) and the render.
+    """
+
+    few = 5
+    many = 50
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="query budget")
+        endpoints = [
+            Endpoint.objects.create(category=category, name=f"budget-{i}", method="GET", url="https://example.com")
+            for i in range(cls.many)
+        ]
+        cls.small, cls.large = endpoints[0], endpoints[1]
+        for endpoint, children in ((cls.small, cls.few), (cls.large, cls.many)):
+            Example.objects.bulk_create([
+                Example(api=endpoint, language=f"lang-{i}", request_type="http", code_snippet="...")
+                for i in range(children)
+            ])
+            ResponseModel.objects.bulk_create([
+                ResponseModel(api=endpoint, status_code=200 + i) for i in range(children)
+            ])
+            Media.objects.bulk_create([Media(api=endpoint, file=f"api_media/{i}.png") for i in range(children)])
+        # A soft-deleted child must never be rendered
+        Example.objects.create(api=cls.large, language="deleted", request_type="http", is_deleted=True)
+
+    def get(self, url, page_size=None):
+        """``(queries run, response)`` for a cold-cache request."""
+        # Every request sees the same rows, hence the same catalog version,
+        # and the cache outlives test transactions; bulk_create sends no signals
+        catalog_cache.cache.clear()
+        catalog_cache.bump()
+        # Catalog lists use PageNumberPagination, which takes no page size parameter
+        with mock.patch.object(PageNumberPagination, "page_size", page_size or self.many):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def assertConstantQueries(self, url):
+        few, _ = self.get(url, self.few)
+        many, response = self.get(url, self.many)
+        self.assertEqual(len(response.json()["results"]), self.many)
+        self.assertEqual(few, many, f"{url} runs {few} queries for {self.few} rows but {many} for {self.many}")
+
+    def test_endpoint_detail(self):
+        few, _ = self.get(f"/api/management/endpoints/{self.small.slug}/")
+        many, response = self.get(f"/api/management/endpoints/{self.large.slug}/")
+        examples = response.json()["data"]["examples"]
+        self.assertEqual(len(examples), self.many)
+        self.assertNotIn("deleted", [example["language"] for example in examples])
+        self.assertEqual(few, many)
+
+    def test_endpoint_list(self):
+        self.assertConstantQueries("/api/management/endpoints/")
+
+    def test_example_list(self):
+        self.assertConstantQueries("/api/management/examples/")
+
+    def test_response_list(self):
+        self.assertConstantQueries("/api/management/responses/")
+
+    def test_media_list(self):
+        self.assertConstantQueries("/api/management/media/")
+
+    def test_cached_list_runs_no_query(self):
+        self.get("/api/management/endpoints/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/management/endpoints/")
+
+# =========================================================
+# FastSerializer
+# =========================================================
+class FastSerializerTests(TestCase):
+    """Compiled plans render what the serializer renders, once per real field set."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="fast", description="<p>category</p>")
+        for i in range(3):
+            Endpoint.objects.create(
+                category=category, name=f"fast-{i}", method="GET", url="https://example.com", description=f"<p>{i}</p>"
+            )
+
+    def setUp(self):
+        catalog_cache.bump()
+        self.fast_serializer = EndpointViewSet.fast_serializer
+
+    def test_default_plan_matches_serializer(self):
+        queryset = Endpoint.objects.order_by("pk")
+        plan = self.fast_serializer.default_plan
+        self.assertIsNotNone(plan)
+        self.assertEqual(plan.render(plan.rows(queryset)), EndpointSerializer(queryset, many=True).data)
+
+    def test_unknown_fields_share_one_plan(self):
+        self.client.get("/api/management/endpoints/", {"fields": "junk0"})
+        plans = len(self.fast_serializer._plans)
+        for i in range(1, 20):
+            response = self.client.get("/api/management/endpoints/", {"fields": f"junk{i}", "expand": f"junk{i}"})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.fast_serializer._plans), plans)
+
+    def test_plan_cache_is_bounded(self):
+        fast_serializer = FastSerializer(EndpointSerializer, max_plans=1)
+        request = Request(APIRequestFactory().get("/", {"fields": "name"}))
+        self.assertIsNone(fast_serializer.plan_for(EndpointSerializer(context={"request": request})))
+        self.assertEqual(len(fast_serializer._plans), 1)
+
+# =========================================================
+# Query plans
+# =========================================================
+# Canned PostgreSQL EXPLAIN output: a nested Sort over a Seq Scan
+POSTGRESQL_PLAN = """\
+Limit  (cost=25.88..25.91 rows=11 width=96)
+  ->  Sort  (cost=25.88..26.10 rows=87 width=96)
+        Sort Key: request_time DESC, id DESC
+        ->  Seq Scan on management_usage  (cost=10000000000.00..10000000023.95 rows=87 width=96)
+              Filter: (NOT is_deleted)"""
+
+POSTGRESQL_INDEX_PLAN = """\
+Limit  (cost=0.15..1.02 rows=11 width=96)
+  ->  Index Scan using mgmt_usage_active_idx on management_usage  (cost=0.15..6.97 rows=87 width=96)"""
+
+
+class QueryPlanParsingTests(SimpleTestCase):
+    """The plan helpers read real multi-line EXPLAIN output of every supported vendor."""
+
+    def test_postgresql_sort_and_seq_scan(self):
+        self.assertTrue(sorts(POSTGRESQL_PLAN))
+        self.assertEqual(scanned_tables(POSTGRESQL_PLAN, "postgresql"), ["management_usage"])
+
+    def test_postgresql_top_level_sort(self):
+        self.assertTrue(sorts("Sort  (cost=1.00..1.10 rows=4 width=8)\n  Sort Key: name\n  ->  Index Scan using x on t"))
+
+    def test_postgresql_index_order(self):
+        self.assertFalse(sorts(POSTGRESQL_INDEX_PLAN))
+        self.assertEqual(scanned_tables(POSTGRESQL_INDEX_PLAN, "postgresql"), [])
+
+    def test_sqlite_temp_btree(self):
+        plan = "2 0 0 SCAN management_usage\n9 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertTrue(sorts(plan))
+        self.assertEqual(scanned_tables(plan, "sqlite"), ["management_usage"])
+
+@unittest.skipUnless(connection.vendor in FULL_SCAN_PATTERNS, "no query plan checks for this database")
+class QueryPlanTests(TestCase):
+    """Hot querysets must be served by an index, never by a full table scan."""
+
+    def assertIndexed(self, label):
+        queryset = dict(hot_querysets())[label]
+        scanned, plan = full_scans(queryset)
+        self.assertEqual(scanned, [], f"{label} scans {', '.join(scanned)}:\n{plan}")
+
+    def test_category_list(self):
+        self.assertIndexed("category list")
+
+    def test_endpoint_list(self):
+        self.assertIndexed("endpoint list")
+
+    def test_endpoints_by_category(self):
+        self.assertIndexed("endpoints by category")
+
+    def test_examples_of_endpoint(self):
+        self.assertIndexed("examples of endpoint")
+
+    def test_responses_of_endpoint(self):
+        self.assertIndexed("responses of endpoint")
+
+    def test_media_of_endpoint(self):
+        self.assertIndexed("media of endpoint")
+
+    def test_subscription_page(self):
+        self.assertIndexed("subscription page")
+
+    def test_subscription_lookup(self):
+        self.assertIndexed("subscription lookup")
+
+    def test_usage_first_page(self):
+        self.assertIndexed("usage first page")
+
+    def test_usage_keyset_page(self):
+        self.assertIndexed("usage keyset page")
+
+    def test_usage_latency_window(self):
+        self.assertIndexed("usage latency window")
+
+    def test_usage_db_time_window(self):
+        self.assertIndexed("usage db time window")
+
+    def test_usage_rollup_slice(self):
+        self.assertIndexed("usage rollup slice")
+
+    def test_usage_archive_batch(self):
+        self.assertIndexed("usage archive batch")
+
+    def test_hourly_rollups_per_user(self):
+        self.assertIndexed("hourly rollups per user")
+
+    def test_hourly_rollup_merge(self):
+        self.assertIndexed("hourly rollup merge")
+
+    def test_daily_rollup_merge(self):
+        self.assertIndexed("daily rollup merge")
+
+    @unittest.skipUnless(apps.is_installed("logs"), "logs app is not installed")
+    def test_request_log_usage_count(self):
+        self.assertIndexed("request log usage_count")
+
+    @unittest.skipUnless(apps.is_installed("logs"), "logs app is not installed")
+    def test_request_log_first_page(self):
+        self.assertIndexed("request log first page")
+
+    @unittest.skipUnless(apps.is_installed("logs"), "logs app is not installed")
+    def test_request_log_keyset_page(self):
+        self.assertIndexed("request log keyset page")
@@ -7,7 +7,8 @@ from .views import (
     ResponseViewSet,
     UsageViewSet,
     MediaViewSet,
-    SubscriptionViewSet
+    SubscriptionViewSet,
+    CatalogSnapshotView
 )
 
 router = DefaultRouter()
@@ -20,5 +21,6 @@ router.register('usages', UsageViewSet, basename='usage')
 router.register('media', MediaViewSet, basename='media')
 
 urlpatterns = [
+    path('catalog/snapshot/', CatalogSnapshotView.as_view(), name='catalog-snapshot'),
     path('', include(router.urls)),
 ]
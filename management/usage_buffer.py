@@ -0,0 +1,145 @@
+import queue
+import threading
+from collections import Counter, namedtuple
+from django.conf import settings
+from django.utils import timezone
+from core.workers import PeriodicFlusher
+from management.models import Usage
+
+# =========================================================
+# Usage Record – compact, DB-free payload put on the queue
+# =========================================================
+UsageRecord = namedtuple(
+    "UsageRecord",
+    [
+        "subscription_id", "status_code", "method", "request_body", "query_params",
+        "duration_ms", "db_duration_ms", "latency_bucket",
+    ],
+    defaults=(None, None, None),
+)
+
+# =========================================================
+# UsageBuffer – bounded queue + batched background writer
+# =========================================================
+class UsageBuffer:
+    """
+    In-process bounded queue of usage records.
+
+    The request thread only calls ``push()``. A background flusher drains the
+    queue every ``flush_interval_ms`` (or as soon as ``batch_size`` records are
+    waiting) and writes them with ``bulk_create``. When the queue is full new
+    records are dropped and counted instead of blocking the request. A batch
+    that fails to write (e.g. ``database is locked``) is kept and retried
+    first on the next flush, up to ``max_retries`` times, before it is
+    dropped and counted as failed.
+    """
+
+    def __init__(self, max_size=10000, batch_size=500, flush_interval_ms=1000, max_retries=3):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_retries = max_retries
+        self._queue = queue.Queue(maxsize=max_size)
+        self._retry = []  # [(attempts, batch)] awaiting the next flush
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = Counter()
+        self.last_flush_at = None
+        self.flusher = PeriodicFlusher(
+            self.flush,
+            interval=flush_interval_ms / 1000,
+            name="UsageBuffer",
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_size=getattr(settings, "USAGE_BUFFER_MAX_SIZE", 10000),
+            batch_size=getattr(settings, "USAGE_BUFFER_BATCH_SIZE", 500),
+            flush_interval_ms=getattr(settings, "USAGE_BUFFER_FLUSH_INTERVAL_MS", 1000),
+            max_retries=getattr(settings, "USAGE_BUFFER_MAX_RETRIES", 3),
+        )
+
+    def _incr(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def push(self, record):
+        """Enqueue a record without blocking. Returns False if it was dropped."""
+        self.flusher.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._incr("dropped")
+            return False
+        self._incr("enqueued")
+        if self._queue.qsize() >= self.batch_size:
+            self.flusher.wake()
+        return True
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Write everything currently queued. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            pending, self._retry = self._retry, []
+            while True:
+                attempts, batch = pending.pop(0) if pending else (0, self._drain())
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    attempts += 1
+                    if attempts > self.max_retries:
+                        self._incr("failed", len(batch))
+                        print(f"[UsageBuffer] Dropping {len(batch)} usage records after {attempts} attempts: {e}")
+                        continue
+                    # Likely transient; keep the batch and leave the rest for the next flush
+                    self._incr("retried", len(batch))
+                    self._retry = [(attempts, batch)] + pending
+                    print(f"[UsageBuffer] Failed to write {len(batch)} usage records, will retry: {e}")
+                    break
+                written += len(batch)
+            if written:
+                self._incr("written", written)
+                self._incr("flushes")
+                self.last_flush_at = timezone.now()
+        return written
+
+    def _write(self, batch):
+        Usage.objects.bulk_create(
+            [Usage(**record._asdict()) for record in batch],
+            batch_size=self.batch_size,
+        )
+
+    def metrics(self):
+        """Snapshot of queue depth and lifetime counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "retry_depth": sum(len(batch) for _, batch in self._retry),
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval_ms,
+            "enqueued": stats.get("enqueued", 0),
+            "written": stats.get("written", 0),
+            "dropped": stats.get("dropped", 0),
+            "retried": stats.get("retried", 0),
+            "failed": stats.get("failed", 0),
+            "flushes": stats.get("flushes", 0),
+            "last_flush_at": self.last_flush_at,
+            "flusher_running": self.flusher.running,
+        }
+
+
+usage_buffer = UsageBuffer.from_settings()
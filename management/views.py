@@ -1,6 +1,18 @@
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.exports import stream_export
+from core.fast_serializers import FastListMixin, FastSerializer
+from core.conditional import ConditionalGetMixin
+from core.content_encoding import choose_encoding
+from core.pagination import KeysetPagination
+from core.response_cache import CachedResponseMixin
+from core.sparse import SparseFieldsetViewMixin
 from core.utils import api_success, api_error
 from accounts.permissions import IsAdminUser
 from management.models import (
@@ -21,17 +33,27 @@ from management.serializers import (
     UsageSerializer,
     SubscriptionSerializer
 )
+from management.analytics import latency_percentiles, parse_window
+from management.catalog_cache import catalog_cache
+from management.counters import usage_counter
+from management.search import FullTextSearchFilter
+from management.snapshot import catalog_snapshot
+from management.subscription_cache import subscription_cache
+from management.usage_buffer import usage_buffer
 
 # ----------------------------
 # Category ViewSet
 # ----------------------------
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Category.objects.filter(is_deleted=False)
     serializer_class = CategorySerializer
     lookup_field = 'slug'
     permission_classes = [IsAdminUser]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_kind = 'category'
     search_fields = ['name']
     ordering_fields = ['name', 'created_at']
+    list_deferred_fields = ['description']
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -39,10 +61,10 @@ class CategoryViewSet(viewsets.ModelViewSet):
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return api_success(
-            data=serializer.data,
-            message=f"{len(serializer.data)} categories found",
+            data=data,
+            message=f"{len(data)} categories found",
             status_code=status.HTTP_200_OK
         )
 
@@ -86,19 +108,31 @@ class CategoryViewSet(viewsets.ModelViewSet):
             status_code=status.HTTP_204_NO_CONTENT
         )
 
+    @action(detail=True, methods=['get'], url_path='description')
+    def description_html(self, request, *args, **kwargs):
+        """The rich-text description as HTML (left out of list pages)."""
+        return self.column_response('description', 'text/html; charset=utf-8')
+
 # ----------------------------
 # Endpoint ViewSet
 # ----------------------------
-class EndpointViewSet(viewsets.ModelViewSet):
+class EndpointViewSet(FastListMixin, SparseFieldsetViewMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Endpoint.objects.filter(is_deleted=False)
     serializer_class = EndpointSerializer
+    fast_serializer = FastSerializer(EndpointSerializer)
+    response_cache = catalog_cache
+    conditional_related = ('category',)
+    conditional_children = ((Example, 'api'), (ResponseModel, 'api'), (Media, 'api'))
     permission_classes = [IsAdminUser]
     lookup_field = 'slug'
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_kind = 'endpoint'
     search_fields = ['name', 'url']
     ordering_fields = ['name', 'created_at']
+    list_deferred_fields = ['description', 'category.description']
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'description_html']:
             return [AllowAny()]
         return [IsAdminUser()]
 
@@ -107,16 +141,25 @@ class EndpointViewSet(viewsets.ModelViewSet):
             return EndpointDetailSerializer
         return EndpointSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('category')
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('examples', queryset=Example.objects.all()),
+                Prefetch('responses', queryset=ResponseModel.objects.all()),
+                Prefetch('media', queryset=Media.objects.all()),
+            )
+        return queryset
+
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.fast_list_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
+            return self.get_paginated_response(self.serialize_page(page))
+        data = self.serialize_page(queryset)
         return api_success(
-            data=serializer.data,
-            message=f"{len(serializer.data)} APIs found",
+            data=data,
+            message=f"{len(data)} APIs found",
             status_code=status.HTTP_200_OK
         )
 
@@ -160,33 +203,55 @@ class EndpointViewSet(viewsets.ModelViewSet):
             status_code=status.HTTP_204_NO_CONTENT
         )
 
+    @action(detail=True, methods=['get'], url_path='description')
+    def description_html(self, request, *args, **kwargs):
+        """The rich-text documentation as HTML (left out of list pages)."""
+        return self.column_response('description', 'text/html; charset=utf-8')
+
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request, *args, **kwargs):
+        """Catalog response cache version and hit ratio (this worker)."""
+        return api_success(
+            data=catalog_cache.stats(),
+            message="Catalog cache stats retrieved successfully",
+            status_code=status.HTTP_200_OK
+        )
+
 # ----------------------------
 # Example ViewSet
 # ----------------------------
-class ExampleViewSet(viewsets.ModelViewSet):
+class ExampleViewSet(FastListMixin, SparseFieldsetViewMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Example.objects.filter(is_deleted=False)
     serializer_class = ExampleSerializer
+    fast_serializer = FastSerializer(ExampleSerializer)
+    response_cache = catalog_cache
+    conditional_related = ('api', 'api__category')
     permission_classes = [IsAdminUser]
     lookup_field = 'id'
     
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_kind = 'example'
     search_fields = ['language']
     ordering_fields = ['language', 'request_type', 'created_at']
+    list_deferred_fields = ['code_snippet', 'api.description', 'api.category.description']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'code']:
             return [AllowAny()]
         return [IsAdminUser()]
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('api__category')
+
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.fast_list_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(queryset, many=True)
+            return self.get_paginated_response(self.serialize_page(page))
+        data = self.serialize_page(queryset)
         return api_success(
-            data=serializer.data,
-            message=f"{len(serializer.data)} API Examples found",
+            data=data,
+            message=f"{len(data)} API Examples found",
             status_code=status.HTTP_200_OK
         )
     
@@ -230,28 +295,40 @@ class ExampleViewSet(viewsets.ModelViewSet):
             status_code=status.HTTP_204_NO_CONTENT
         )
 
+    @action(detail=True, methods=['get'], url_path='code')
+    def code(self, request, *args, **kwargs):
+        """The code snippet as plain text (left out of list pages)."""
+        return self.column_response('code_snippet', 'text/plain; charset=utf-8')
+
 # ----------------------------
 # Response ViewSet
 # ----------------------------
-class ResponseViewSet(viewsets.ModelViewSet):
+class ResponseViewSet(SparseFieldsetViewMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = ResponseModel.objects.filter(is_deleted=False)
     serializer_class = ResponseSerializer
+    response_cache = catalog_cache
+    conditional_related = ('api', 'api__category')
     lookup_field = 'id'
     search_fields = ['status_code', 'media_type']
     ordering_fields = ['status_code', 'created_at']
+    list_deferred_fields = ['headers', 'body', 'api.description', 'api.category.description']
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'body', 'response_headers']:
             return [AllowAny()]
         return [IsAdminUser()]
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('api__category')
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page if page else queryset, many=True)
         if page:
             return self.get_paginated_response(serializer.data)
-        return api_success(data=serializer.data, message=f"{len(serializer.data)} API Responses found")
+        data = serializer.data
+        return api_success(data=data, message=f"{len(data)} API Responses found")
 
     def retrieve(self, request, *args, **kwargs):
         serializer = self.get_serializer(self.get_object())
@@ -275,24 +352,37 @@ class ResponseViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return api_success(data=None, message="API Response deleted successfully", status_code=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=['get'], url_path='body')
+    def body(self, request, *args, **kwargs):
+        """The stored example body as JSON (left out of list pages)."""
+        return self.column_response('body', 'application/json')
+
+    @action(detail=True, methods=['get'], url_path='headers')
+    def response_headers(self, request, *args, **kwargs):
+        """The stored example headers as JSON (left out of list pages)."""
+        return self.column_response('headers', 'application/json')
+
 # ----------------------------
 # Subscription ViewSet
 # ----------------------------
-class SubscriptionViewSet(viewsets.ModelViewSet):
-    queryset = Subscription.objects.all()
+class SubscriptionViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Subscription.objects.select_related('user', 'api').all()
     serializer_class = SubscriptionSerializer
     permission_classes = [IsAdminUser]  
     ordering_fields = ['accessed_at', 'usage_count']
+    pagination_class = KeysetPagination
+    keyset_field = 'created_at'
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(page if page else queryset, many=True)
-        if page:
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
+        data = self.get_serializer(queryset, many=True).data
         return api_success(
-            data=serializer.data,
-            message=f"{len(serializer.data)} subscriptions found",
+            data=data,
+            message=f"{len(data)} subscriptions found",
             status_code=status.HTTP_200_OK
         )
 
@@ -338,18 +428,25 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
 # ----------------------------
 # Media ViewSet
 # ----------------------------
-class MediaViewSet(viewsets.ModelViewSet):
+class MediaViewSet(SparseFieldsetViewMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Media.objects.filter(is_deleted=False)
     serializer_class = MediaSerializer
+    response_cache = catalog_cache
+    conditional_related = ('api',)
     lookup_field = "id"
     search_fields = ["description"]
     ordering_fields = ["created_at"]
+    list_deferred_fields = ["description"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "description_html"]:
             return [AllowAny()] 
         return [IsAdminUser()]  
 
+    def get_queryset(self):
+        # MediaSerializer.api renders Endpoint.__str__
+        return super().get_queryset().select_related("api")
+
     def get_serializer(self, *args, **kwargs):
         if self.request.method == "PATCH":
             kwargs["partial"] = True
@@ -361,7 +458,8 @@ class MediaViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(page or queryset, many=True)
         if page:
             return self.get_paginated_response(serializer.data)
-        return api_success(data=serializer.data, message=f"{len(serializer.data)} API Media found")
+        data = serializer.data
+        return api_success(data=data, message=f"{len(data)} API Media found")
 
     def retrieve(self, request, *args, **kwargs):
         serializer = self.get_serializer(self.get_object())
@@ -385,28 +483,50 @@ class MediaViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return api_success(data=None, message="API Media deleted successfully", status_code=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=True, methods=["get"], url_path="description")
+    def description_html(self, request, *args, **kwargs):
+        """The rich-text description as HTML (left out of list pages)."""
+        return self.column_response("description", "text/html; charset=utf-8")
+
 # ----------------------------
 # Usage ViewSet
 # ----------------------------
-class UsageViewSet(viewsets.ReadOnlyModelViewSet):
+class UsageViewSet(FastListMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only API for admin/dashboard to see usage records.
     """
+    export_columns = [
+        ('id', 'id'),
+        ('user', 'subscription__user__username'),
+        ('api_name', 'subscription__api__name'),
+        ('api_slug', 'subscription__api__slug'),
+        ('method', 'method'),
+        ('status_code', 'status_code'),
+        ('request_body', 'request_body'),
+        ('query_params', 'query_params'),
+        ('request_time', 'request_time'),
+        ('duration_ms', 'duration_ms'),
+        ('db_duration_ms', 'db_duration_ms'),
+    ]
     queryset = Usage.objects.select_related('subscription__user', 'subscription__api').all()
     serializer_class = UsageSerializer
+    fast_serializer = FastSerializer(UsageSerializer)
     permission_classes = [IsAdminUser]
     search_fields = ['status_code', 'request_time']
     ordering_fields = ['request_time', 'status_code', 'method']
+    pagination_class = KeysetPagination
+    keyset_field = 'request_time'
+    list_deferred_fields = ['request_body']
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.fast_list_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(page if page else queryset, many=True)
-        if page:
-            return self.get_paginated_response(serializer.data)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_page(page))
+        data = self.serialize_page(queryset)
         return api_success(
-            data=serializer.data,
-            message=f"{len(serializer.data)} API usage records found",
+            data=data,
+            message=f"{len(data)} API usage records found",
             status_code=status.HTTP_200_OK
         )
 
@@ -417,3 +537,80 @@ class UsageViewSet(viewsets.ReadOnlyModelViewSet):
             message="API usage record retrieved successfully",
             status_code=status.HTTP_200_OK
         )
+
+    @action(detail=True, methods=['get'], url_path='request-body')
+    def request_body(self, request, *args, **kwargs):
+        """The recorded request body as JSON (left out of list pages)."""
+        return self.column_response('request_body', 'application/json')
+
+    @action(detail=False, methods=['get'], url_path='ingestion')
+    def ingestion(self, request, *args, **kwargs):
+        """Health of the usage pipeline: write buffer, pending counters, subscription cache."""
+        return api_success(
+            data={
+                "buffer": usage_buffer.metrics(),
+                "pending_usage_increments": usage_counter.pending(),
+                "subscription_cache": subscription_cache.stats(),
+            },
+            message="Usage ingestion metrics retrieved successfully",
+            status_code=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['get'], url_path='latency')
+    def latency(self, request, *args, **kwargs):
+        """p50/p95/p99 latency per endpoint over ?hours= (default 24) or ?since=&until=."""
+        try:
+            since, until = parse_window(request.query_params)
+        except ValueError as e:
+            return api_error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        return api_success(
+            data={
+                "since": since,
+                "until": until,
+                "endpoints": latency_percentiles(since, until),
+            },
+            message="API latency percentiles retrieved successfully",
+            status_code=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, *args, **kwargs):
+        """Stream every matching usage record as ?file_format=csv (default) or ndjson."""
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            return stream_export(
+                queryset,
+                self.export_columns,
+                export_format=request.query_params.get('file_format', 'csv'),
+                filename='usage',
+            )
+        except ValueError as e:
+            return api_error(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
+# ----------------------------
+# Catalog snapshot
+# ----------------------------
+class CatalogSnapshotView(APIView):
+    """
+    The whole public catalog in one pre-compressed JSON document (see
+    management.snapshot), served as stored: br or gzip per Accept-Encoding,
+    with a strong ETag per encoding.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        artifact = catalog_snapshot.get()
+        encodings = tuple(coding for coding in artifact["content"] if coding != "identity")
+        coding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), encodings) or "identity"
+        etag = artifact["etags"][coding]
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(artifact["content"][coding], content_type="application/json")
+            if coding != "identity":
+                response["Content-Encoding"] = coding
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, no-cache"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
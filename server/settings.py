@@ -63,10 +63,13 @@ AUTH_USER_MODEL = "accounts.User"
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
+    # Outside everything that reads or writes response bodies
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'management.middleware.QuotaMiddleware',
     'management.middleware.APILoggingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -111,6 +114,39 @@ DATABASES = {
     }
 }
 
+# -----------------------------
+# CACHE
+# -----------------------------
+# Shared state (quota counters, route index generation) is only shared across
+# workers with a shared backend, e.g. django.core.cache.backends.redis.RedisCache
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    # Rendered public catalog responses; FileBasedCache works too
+    'catalog': {
+        'BACKEND': config('CATALOG_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CATALOG_CACHE_LOCATION', default='catalog'),
+        'OPTIONS': {'MAX_ENTRIES': config('CATALOG_CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    },
+}
+CATALOG_CACHE_ALIAS = 'catalog'
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=300, cast=int)
+# Longest a worker serves catalog responses and the snapshot without
+# re-reading the catalog version from the database
+CATALOG_VERSION_MAX_AGE_SECONDS = config('CATALOG_VERSION_MAX_AGE_SECONDS', default=5, cast=float)
+# Pre-compressed catalog snapshot and its per-endpoint fragments (catalog cache)
+CATALOG_SNAPSHOT_TIMEOUT = config('CATALOG_SNAPSHOT_TIMEOUT', default=86400, cast=int)
+
+# -----------------------------
+# RESPONSE COMPRESSION
+# -----------------------------
+# Catalog-cached responses are compressed once per encoding (catalog cache)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+
 # -----------------------------
 # REST FRAMEWORK
 # -----------------------------
@@ -127,9 +163,73 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "EXCEPTION_HANDLER": "core.exceptions.custom_exception_handler",
 }
 
+# -----------------------------
+# USAGE INGESTION
+# -----------------------------
+USAGE_BUFFER_MAX_SIZE = config('USAGE_BUFFER_MAX_SIZE', default=10000, cast=int)
+USAGE_BUFFER_BATCH_SIZE = config('USAGE_BUFFER_BATCH_SIZE', default=500, cast=int)
+USAGE_BUFFER_FLUSH_INTERVAL_MS = config('USAGE_BUFFER_FLUSH_INTERVAL_MS', default=1000, cast=int)
+USAGE_BUFFER_MAX_RETRIES = config('USAGE_BUFFER_MAX_RETRIES', default=3, cast=int)
+USAGE_COUNTER_FLUSH_INTERVAL_MS = config('USAGE_COUNTER_FLUSH_INTERVAL_MS', default=1000, cast=int)
+SUBSCRIPTION_CACHE_MAX_SIZE = config('SUBSCRIPTION_CACHE_MAX_SIZE', default=10000, cast=int)
+# Also the longest another worker keeps using a deleted subscription's id
+SUBSCRIPTION_CACHE_TTL_SECONDS = config('SUBSCRIPTION_CACHE_TTL_SECONDS', default=300, cast=int)
+# Longest an endpoint index may go without checking the database (per process)
+ENDPOINT_INDEX_MAX_AGE_SECONDS = config('ENDPOINT_INDEX_MAX_AGE_SECONDS', default=5, cast=float)
+# Per-day request-log buckets behind APIRequestLog.usage_count
+USAGE_WINDOW_BUCKET_TTL_SECONDS = config('USAGE_WINDOW_BUCKET_TTL_SECONDS', default=35 * 86400, cast=int)
+USAGE_WINDOW_LIVE_TTL_SECONDS = config('USAGE_WINDOW_LIVE_TTL_SECONDS', default=3600, cast=int)
+
+# Which request bodies end up in Usage.request_body. "endpoints" holds
+# per-endpoint overrides keyed by Endpoint slug, e.g. {"upload-media": {"enabled": False}}
+USAGE_BODY_CAPTURE = {
+    "default": {
+        "enabled": True,
+        "content_types": ["application/json"],
+        "max_bytes": config('USAGE_BODY_CAPTURE_MAX_BYTES', default=8192, cast=int),
+        "sample_rate": config('USAGE_BODY_CAPTURE_SAMPLE_RATE', default=100, cast=float),
+    },
+    "endpoints": {},
+}
+
+# -----------------------------
+# REQUEST QUOTAS
+# -----------------------------
+# Limits for callers without a subscription plan covering the endpoint
+# (and for everyone while the subscription app is disabled); None = unlimited.
+# Unset by default: only limits of configured plans are enforced
+API_QUOTA_ENABLED = config('API_QUOTA_ENABLED', default=True, cast=bool)
+API_DEFAULT_QUOTA = {
+    "requests_per_minute": config('API_DEFAULT_REQUESTS_PER_MINUTE', default='', cast=lambda v: int(v) if v else None),
+    "requests_per_day": config('API_DEFAULT_REQUESTS_PER_DAY', default='', cast=lambda v: int(v) if v else None),
+    "monthly_quota": None,
+}
+# Counters must be shared by all workers: core.ratelimit.SQLiteCounterStore for
+# the workers of one host, or CacheCounterStore on a shared CACHES backend
+# (a process-local cache fails the core.E002 system check)
+API_QUOTA_COUNTER_STORE = config('API_QUOTA_COUNTER_STORE', default='core.ratelimit.SQLiteCounterStore')
+API_QUOTA_PLAN_CACHE_TTL_SECONDS = config('API_QUOTA_PLAN_CACHE_TTL_SECONDS', default=60, cast=int)
+
+# -----------------------------
+# SHARED COUNTERS / THROTTLING
+# -----------------------------
+# SQLite (WAL) file holding counters shared by all workers on this host
+COUNTER_STORE_PATH = config('COUNTER_STORE_PATH', default=str(BASE_DIR / 'var' / 'counters.sqlite3'))
+THROTTLE_COUNTER_STORE = config('THROTTLE_COUNTER_STORE', default='core.ratelimit.SQLiteCounterStore')
+
+# -----------------------------
+# USAGE RETENTION / ARCHIVE
+# -----------------------------
+USAGE_RETENTION_DAYS = config('USAGE_RETENTION_DAYS', default=90, cast=int)
+USAGE_ARCHIVE_ROOT = config('USAGE_ARCHIVE_ROOT', default=str(BASE_DIR / 'archive'))
+
 # -----------------------------
 # SIMPLE JWT
 # -----------------------------
@@ -6,7 +6,7 @@ from .models import SubscriptionPlan, UserSubscription
 # --------------------
 @admin.register(SubscriptionPlan)
 class SubscriptionPlanAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "description", "price", "duration_days", "is_active", "created_at", "updated_at")
+    list_display = ("id", "name", "description", "price", "duration_days", "requests_per_minute", "requests_per_day", "monthly_quota", "is_active", "created_at", "updated_at")
     list_filter = ("is_active", "duration_days", "created_at")
     search_fields = ("name", "description")
     ordering = ("-created_at",)
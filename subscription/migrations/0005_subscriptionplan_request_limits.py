@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0004_alter_subscriptionplan_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='requests_per_minute',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty for no limit', null=True),
+        ),
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='requests_per_day',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty for no limit', null=True),
+        ),
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='monthly_quota',
+            field=models.PositiveIntegerField(blank=True, help_text='Requests per calendar month; leave empty for no limit', null=True),
+        ),
+    ]
@@ -12,6 +12,9 @@ class SubscriptionPlan(BaseModel):
     duration_days = models.IntegerField()
     endpoints = models.ManyToManyField(Endpoint, related_name="plans") 
     is_active = models.BooleanField(default=True)
+    requests_per_minute = models.PositiveIntegerField(null=True, blank=True, help_text="Leave empty for no limit")
+    requests_per_day = models.PositiveIntegerField(null=True, blank=True, help_text="Leave empty for no limit")
+    monthly_quota = models.PositiveIntegerField(null=True, blank=True, help_text="Requests per calendar month; leave empty for no limit")
 
     def __str__(self):
         return self.name
@@ -7,7 +7,10 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SubscriptionPlan
-        fields = ["id", "name", "description", "price", "duration_days", "is_active", "apis"]
+        fields = [
+            "id", "name", "description", "price", "duration_days", "is_active", "apis",
+            "requests_per_minute", "requests_per_day", "monthly_quota",
+        ]
 
 class UserSubscriptionSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)